@@ -1 +1,3 @@
+from ahk_ast.aio import aparse
+from ahk_ast.budget import Budget
 from ahk_ast.parser import parse
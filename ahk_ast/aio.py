@@ -0,0 +1,141 @@
+"""
+asyncio-friendly parsing.
+
+Parsing is CPU bound, so calling :func:`ahk_ast.parse` from a coroutine blocks the event loop.
+:class:`ParseService` runs parses in a pool of worker processes, bounds how many parses are in
+flight at once and cancels stale requests when a newer version of the same document arrives.
+
+Example::
+
+    service = ParseService(max_workers=4)
+    program = await service.parse(text, document='file:///foo.ahk')
+"""
+import asyncio
+import concurrent.futures
+import os
+from typing import Any
+from typing import Hashable
+from typing import Optional
+from typing import Union
+
+from .model import Node
+from .parser import parse
+
+
+def _warm_worker() -> None:
+    # Importing the parser builds the LALR tables; parsing a tiny snippet also
+    # compiles the lexer regexes, so the first real request doesn't pay for either.
+    parse('a := 1')
+
+
+def _parse_in_worker(text: str) -> Node:
+    return parse(text)
+
+
+class ParseService:
+    """
+    Parse documents in worker processes without blocking the event loop.
+
+    :param max_workers: number of worker processes (defaults to the number of CPUs)
+    :param max_concurrency: maximum number of parses submitted to the pool at once. Requests over
+        the limit wait (and can be cancelled cheaply) before reaching a worker. Defaults to
+        ``max_workers``.
+    :param executor: an existing executor to use instead of creating a process pool. The service
+        does not shut down executors it did not create.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ):
+        self._max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._max_concurrency = max_concurrency or max_workers or os.cpu_count() or 1
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: dict[Hashable, 'asyncio.Future[Node]'] = {}
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._max_workers, initializer=_warm_worker
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # the semaphore and pending futures belong to the loop they were created on; a service
+        # used from a new loop (e.g. a second asyncio.run) starts over with fresh ones
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._pending = {}
+        return self._semaphore
+
+    async def _parse(self, text: str, semaphore: asyncio.Semaphore) -> Node:
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            return await loop.run_in_executor(self._get_executor(), _parse_in_worker, text)
+
+    async def parse(self, text: str, document: Optional[Hashable] = None) -> Node:
+        """
+        Parse ``text`` in a worker process.
+
+        If ``document`` is given, any earlier request for the same document that is still pending
+        is cancelled; its caller receives :class:`asyncio.CancelledError`. A request that is still
+        waiting for a free slot never reaches a worker. Parse errors raised in the worker
+        are re-raised here.
+        """
+        semaphore = self._get_semaphore()
+        if document is None:
+            return await self._parse(text, semaphore)
+
+        previous = self._pending.get(document)
+        if previous is not None:
+            previous.cancel()
+        request = asyncio.ensure_future(self._parse(text, semaphore))
+        self._pending[document] = request
+        try:
+            return await request
+        finally:
+            if self._pending.get(document) is request:
+                del self._pending[document]
+
+    def cancel(self, document: Hashable) -> bool:
+        """
+        Cancel the pending request for ``document``, if any. Returns ``True`` if a request was cancelled.
+        """
+        request = self._pending.pop(document, None)
+        if request is None:
+            return False
+        return request.cancel()
+
+    def close(self) -> None:
+        for request in self._pending.values():
+            request.cancel()
+        self._pending.clear()
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self) -> 'ParseService':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+_default_service: Union[ParseService, None] = None
+
+
+async def aparse(text: str, document: Optional[Hashable] = None) -> Node:
+    """
+    Parse ``text`` without blocking the event loop, using a shared :class:`ParseService`.
+    """
+    global _default_service
+    if _default_service is None:
+        _default_service = ParseService()
+    return await _default_service.parse(text, document=document)
@@ -0,0 +1,125 @@
+"""
+Parse many files and report the results as JSON Lines.
+
+One JSON object is written to stdout per file as soon as it has been parsed::
+
+    {"path": "a.ahk", "status": "ok", "error": null, "nodes": 12,
+     "node_counts": {"Program": 1, "Assignment": 4, ...}, "seconds": 0.0012}
+
+    {"path": "b.ahk", "status": "error",
+     "error": {"type": "AHKParsingException", "message": "...", "line": 3, "column": 7},
+     "nodes": 0, "node_counts": {}, "seconds": 0.0004}
+
+Files are parsed in a process pool, so results arrive in completion order rather than in the
+order given. ``seconds`` covers reading and parsing the file in the worker.
+"""
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import sys
+import time
+from collections import Counter
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+
+from .errors import AHKAstBaseException
+from .model import walk
+from .parser import parse
+
+
+def _error_info(error: Exception) -> dict[str, Any]:
+    return {
+        'type': type(error).__name__,
+        'message': str(error),
+        'line': getattr(error, 'lineno', None),
+        'column': getattr(error, 'colno', None),
+    }
+
+
+def parse_file(path: str) -> dict[str, Any]:
+    """
+    Parse one file and return its result record
+    """
+    start = time.perf_counter()
+    counts: Counter[str] = Counter()
+    error = None
+    try:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        for node in walk(parse(text)):
+            counts[type(node).__name__] += 1
+    except (OSError, UnicodeDecodeError, AHKAstBaseException) as e:
+        error = _error_info(e)
+        counts.clear()
+    return {
+        'path': path,
+        'status': 'ok' if error is None else 'error',
+        'error': error,
+        'nodes': sum(counts.values()),
+        'node_counts': dict(counts),
+        'seconds': round(time.perf_counter() - start, 6),
+    }
+
+
+def expand_paths(patterns: Iterable[str]) -> list[str]:
+    """
+    Expand glob patterns (``**`` matches subdirectories), keeping only the matches that are
+    files. Other arguments are kept as given, so missing files are reported as errors rather than
+    silently skipped.
+    """
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(
+                path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)
+            )
+        else:
+            matches = [pattern]
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def parse_files(
+    paths: Sequence[str], max_workers: Optional[int] = None
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield a result record for each of ``paths`` as it completes. With ``max_workers=1`` the files
+    are parsed in this process, in order.
+    """
+    if max_workers == 1:
+        for path in paths:
+            yield parse_file(path)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(parse_file, path) for path in paths]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m ahk_ast',
+        description='Parse AutoHotkey files and write one JSON object per file to stdout.',
+    )
+    arg_parser.add_argument('paths', nargs='+', help='files or glob patterns')
+    arg_parser.add_argument(
+        '-j', '--jobs', type=int, default=None, help='worker processes (default: CPU count)'
+    )
+    args = arg_parser.parse_args(argv)
+
+    status = 0
+    for record in parse_files(expand_paths(args.paths), args.jobs):
+        if record['status'] != 'ok':
+            status = 1
+        sys.stdout.write(json.dumps(record) + '\n')
+        sys.stdout.flush()
+    return status
@@ -0,0 +1,72 @@
+"""
+Limits on the work done for a single input.
+
+A :class:`Budget` bounds the input size, the number of tokens, the nesting depth of brackets
+and the wall-clock time of one tokenize or parse. Pass it as ``budget=`` to
+:func:`~ahk_ast.parser.parse`, :func:`~ahk_ast.parser.parse_tokens` or
+:func:`~ahk_ast.tokenizer.tokenize`; the tokenizer loop and the parser's token stream check it
+as they go and raise :class:`~ahk_ast.errors.AHKBudgetExceededError`, which records how far the
+work got, as soon as a limit is exceeded.
+
+    parse(text, budget=Budget(max_tokens=100_000, timeout=0.05))
+"""
+import math
+import time
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+from .errors import AHKBudgetExceededError
+
+# the clock is read every CLOCK_INTERVAL tokens; must be a power of two
+CLOCK_INTERVAL = 64
+
+
+class Budget(NamedTuple):
+    """
+    Limits for one parse; ``None`` means unlimited.
+
+    The clock for ``timeout`` starts when the tokenizer or parser starts the budget (see
+    :meth:`start`), so the same ``Budget`` can be reused for many inputs.
+    """
+
+    max_input_size: Optional[int] = None  # characters (bytes for byte input)
+    max_tokens: Optional[int] = None
+    max_depth: Optional[int] = None  # open parentheses, brackets and braces
+    timeout: Optional[float] = None  # seconds
+    started_at: Optional[float] = None
+
+    def start(self) -> 'Budget':
+        """
+        Return this budget with its clock started, unless it already is.
+        """
+        if self.started_at is not None:
+            return self
+        return self._replace(started_at=time.perf_counter())
+
+    @property
+    def deadline(self) -> float:
+        """
+        The :func:`time.perf_counter` value after which the budget is exceeded
+        """
+        if self.timeout is None or self.started_at is None:
+            return math.inf
+        return self.started_at + self.timeout
+
+    def exceeded(self, limit: str, tokens: int, token: Any = None) -> AHKBudgetExceededError:
+        """
+        The error for exceeding ``limit`` after ``tokens`` tokens, the last of which is ``token``.
+        """
+        elapsed = 0.0 if self.started_at is None else time.perf_counter() - self.started_at
+        return AHKBudgetExceededError(
+            limit,
+            getattr(self, limit),
+            tokens=tokens,
+            index=getattr(token, 'index', 0),
+            lineno=getattr(token, 'lineno', 0),
+            elapsed=elapsed,
+        )
+
+    def check_input(self, text: Any) -> None:
+        if self.max_input_size is not None and len(text) > self.max_input_size:
+            raise self.exceeded('max_input_size', 0)
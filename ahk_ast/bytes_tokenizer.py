@@ -0,0 +1,172 @@
+"""
+Tokenize UTF-8 encoded source without decoding it.
+
+:func:`tokenize_bytes` runs over ``bytes``, ``bytearray``, ``memoryview`` or ``mmap`` input
+using byte regexes derived from :class:`~ahk_ast.tokenizer.AHKLexer`'s rules, and yields
+:class:`ByteToken` objects that only hold byte offsets. A token's ``value`` is decoded (and
+its ``raw`` bytes copied) only when it is accessed, so workloads that only look at token types
+and positions never decode or copy the input.
+
+The token types and values are the same as those of :func:`~ahk_ast.tokenizer.tokenize`,
+including for the non-ASCII whitespace in the ``WHITESPACE`` rule (no-break space, line and
+paragraph separators and the byte order mark), except that digits are ASCII only: ``\\d``
+in the lexer's ``str`` patterns also matches other Unicode digits. Offsets are byte offsets.
+"""
+from typing import Any
+from typing import Iterator
+from typing import Union
+
+import regex as re  # type: ignore[import]
+
+from .errors import AHKTokenizeError
+from .tokenizer import _split_keyword_rules
+from .tokenizer import AHKLexer
+
+Buffer = Union[bytes, bytearray, memoryview, Any]
+
+# UTF-8 encodings of the characters in the lexer's WHITESPACE class
+_WHITESPACE_CHAR = rb'(?:[\t\x0b\x0c\r ]|\xc2\xa0|\xe2\x80[\xa8\xa9]|\xef\xbb\xbf)'
+
+# rules whose ``str`` patterns contain non-ASCII characters
+_BYTE_PATTERNS = {
+    'INLINE_COMMENT': _WHITESPACE_CHAR + rb';[^\n]*',
+    'WHITESPACE': _WHITESPACE_CHAR + rb'+',
+    'NEWLINE': rb'\n',
+}
+
+_RULES, _KEYWORDS, _COMPOUND_KEYWORDS = _split_keyword_rules()
+_MASTER_RE = re.compile(
+    b'|'.join(
+        b'(?P<%s>%s)' % (name.encode(), _BYTE_PATTERNS.get(name) or pattern.encode('ascii'))
+        for name, pattern in _RULES
+    ),
+    AHKLexer.reflags,
+)
+_BYTE_KEYWORDS = {word.encode(): name for word, name in _KEYWORDS.items()}
+_BYTE_COMPOUND_KEYWORDS = {
+    word.encode(): [(suffix.encode(), name) for suffix, name in variants]
+    for word, variants in _COMPOUND_KEYWORDS.items()
+}
+_NAME_CHAR = re.compile(rb'[a-zA-Z_\d]')
+_BLOCK_COMMENT_END = re.compile(rb'\*/')
+_NEWLINE = re.compile(rb'\n')
+_STRING_SPECIAL = {ord('"'): re.compile(rb'["`]'), ord("'"): re.compile(rb"['`]")}
+_LINEFEED = ord('\n')
+
+
+class ByteToken:
+    """
+    A token in UTF-8 input, as byte offsets into the input.
+    """
+
+    __slots__ = ('type', 'start', 'end', 'lineno', 'data')
+
+    def __init__(self, type: str, start: int, end: int, lineno: int, data: Buffer):
+        self.type = type
+        self.start = start
+        self.end = end
+        self.lineno = lineno
+        self.data = data
+
+    @property
+    def raw(self) -> bytes:
+        return bytes(self.data[self.start : self.end])
+
+    @property
+    def value(self) -> str:
+        return str(self.data[self.start : self.end], 'utf-8')
+
+    def __repr__(self) -> str:
+        return (
+            f'ByteToken(type={self.type!r}, value={self.value!r}, lineno={self.lineno}, '
+            f'start={self.start}, end={self.end})'
+        )
+
+
+def _scan_quoted_string(data: Buffer, pos: int) -> int:
+    """
+    Like :func:`ahk_ast.tokenizer._scan_quoted_string`, for the opening quote at ``pos`` in
+    UTF-8 input. Uses regex searches, since ``memoryview`` has no ``find``.
+    """
+    quote = data[pos]
+    search = _STRING_SPECIAL[quote].search
+    pos += 1
+    while True:
+        found = search(data, pos)
+        if found is None:
+            return -1
+        index: int = found.start()
+        if data[index] == quote:
+            return index + 1
+        if index + 1 >= len(data) or data[index + 1] == _LINEFEED:
+            return -1
+        pos = index + 2
+
+
+def _illegal_character(data: Buffer, pos: int, lineno: int) -> AHKTokenizeError:
+    # decode the whole (possibly multi-byte) character for the message
+    char = str(bytes(data[pos : pos + 4]), 'utf-8', 'replace')[:1]
+    return AHKTokenizeError(f'Illegal character {char!r} at byte {pos} (line {lineno})', None)
+
+
+def tokenize_bytes(data: Buffer, lineno: int = 1) -> Iterator[ByteToken]:
+    """
+    Yield the tokens of the UTF-8 encoded ``data``.
+
+    Raises :class:`~ahk_ast.errors.AHKTokenizeError` for input that
+    :func:`~ahk_ast.tokenizer.tokenize` would reject.
+    """
+    match = _MASTER_RE.match
+    name_char = _NAME_CHAR.match
+    keywords = _BYTE_KEYWORDS
+    compound_keywords = _BYTE_COMPOUND_KEYWORDS
+    length = len(data)
+    comment_end_missing_from = length
+    pos = 0
+    while pos < length:
+        m = match(data, pos)
+        if m is None:
+            raise _illegal_character(data, pos, lineno)
+        kind = m.lastgroup
+        end = m.end()
+        if kind == 'NAME':
+            word = bytes(data[pos:end]).lower()
+            variants = compound_keywords.get(word)
+            if variants is not None:
+                for suffix, compound in variants:
+                    after = end + len(suffix)
+                    if bytes(data[end:after]).lower() == suffix and not name_char(data, after):
+                        kind = compound
+                        end = after
+                        break
+            if kind == 'NAME':
+                kind = keywords.get(word, kind)
+        elif kind == 'NEWLINE':
+            yield ByteToken(kind, pos, end, lineno, data)
+            lineno += 1
+            pos = end
+            continue
+        elif kind == 'BLOCK_COMMENT':
+            found = None
+            if pos < comment_end_missing_from:
+                found = _BLOCK_COMMENT_END.search(data, pos + 2)
+                if found is None:
+                    # no later ``/*`` can be terminated either; see AHKLexer.BLOCK_COMMENT
+                    comment_end_missing_from = pos
+            if found is None:
+                # unterminated; the ``/`` is division, as in AHKLexer
+                kind = 'DIVIDE'
+                end = pos + 1
+            else:
+                end = found.end()
+                token = ByteToken(kind, pos, end, lineno, data)
+                lineno += len(_NEWLINE.findall(data, pos, end))
+                yield token
+                pos = end
+                continue
+        elif kind == 'DOUBLE_QUOTED_STRING' or kind == 'SINGLE_QUOTED_STRING':
+            end = _scan_quoted_string(data, pos)
+            if end == -1:
+                raise _illegal_character(data, pos, lineno)
+        yield ByteToken(kind, pos, end, lineno, data)
+        pos = end
@@ -0,0 +1,100 @@
+"""
+In-process LRU cache of parse results.
+
+Tools that parse the same short snippets over and over (hotkey bodies, templated lines, REPL
+history) can use a :class:`ParseCache` instead of :func:`ahk_ast.parser.parse`. Cached programs
+are frozen (see :func:`ahk_ast.model.freeze`), so every caller can share the same tree without
+being able to corrupt it; use ``copy.deepcopy`` for a copy that can be modified.
+
+Only successful parses are cached; source that fails to parse raises on every call.
+"""
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from .model import freeze
+from .model import Node
+from .parser import parse
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    currsize: int
+    maxsize: int
+
+
+class ParseCache:
+    """
+    Size-bounded LRU cache of frozen parse results, keyed by source text. Safe to share between
+    threads.
+
+    :param maxsize: maximum number of programs kept
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, Node] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def parse(self, text: str) -> Node:
+        """
+        The frozen program for ``text``, parsed on the first request
+        """
+        with self._lock:
+            program = self._entries.get(text)
+            if program is not None:
+                self._entries.move_to_end(text)
+                self.hits += 1
+                return program
+            self.misses += 1
+        # parse outside the lock so other threads' hits aren't blocked; if two threads miss on
+        # the same text, the last result wins, which is harmless
+        program = freeze(parse(text))
+        with self._lock:
+            self._entries[text] = program
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return program
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, len(self._entries), self.maxsize
+            )
+
+    def clear(self) -> None:
+        """
+        Drop all entries and reset the statistics
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, text: object) -> bool:
+        return text in self._entries
+
+
+_default_cache = ParseCache()
+
+
+def cached_parse(text: str) -> Node:
+    """
+    :meth:`ParseCache.parse` with a shared module-level cache
+    """
+    return _default_cache.parse(text)
+
+
+def cache_info() -> CacheInfo:
+    return _default_cache.info()
@@ -0,0 +1,319 @@
+"""
+Columnar (struct-of-arrays) storage for ASTs.
+
+A :class:`ColumnarTree` stores any number of parsed programs as rows of typed arrays instead of
+one Python object per node:
+
+- ``kinds``: node type, as an index into ``kind_types``
+- ``parents``, ``first_child``, ``next_sibling``: tree structure, as node indexes (-1 for none)
+- ``fields``: name of the parent attribute the node is stored in, as an index into ``field_names``
+- ``values``: the node's non-node attributes (``name``, ``value``, ``op``, ...), as an index
+  into the interned ``interned`` table
+
+Nodes are numbered in depth-first order. :class:`NodeView` objects expose the same attributes as
+the :mod:`ahk_ast.model` classes, and queries such as :meth:`ColumnarTree.function_calls` run as
+scans over the arrays.
+"""
+import re
+import struct
+from array import array
+from typing import Any
+from typing import Collection
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+from .model import FunctionCall
+from .model import Identifier
+from .model import iter_fields
+from .model import Node
+from .parser import parse
+
+# an attribute's ``Payload`` is its name/value pairs; the type is part of the interning key
+# so that e.g. ``Integer(value=1)`` and ``Bool(value=True)`` are not merged
+Payload = tuple[tuple[str, Any], ...]
+
+
+class NodeView:
+    """
+    Lightweight read-only view of one node in a :class:`ColumnarTree`.
+
+    Attributes are resolved from the arrays on access; use :meth:`to_node` to materialize a
+    regular :class:`~ahk_ast.model.Node`.
+    """
+
+    __slots__ = ('tree', 'index')
+
+    def __init__(self, tree: 'ColumnarTree', index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def node_type(self) -> type[Node]:
+        return self.tree.kind_types[self.tree.kinds[self.index]]
+
+    @property
+    def parent(self) -> Optional['NodeView']:
+        parent = self.tree.parents[self.index]
+        return None if parent == -1 else NodeView(self.tree, parent)
+
+    def children(self) -> Iterator['NodeView']:
+        tree = self.tree
+        for child in tree.iter_children(self.index):
+            yield NodeView(tree, child)
+
+    def __getattr__(self, name: str) -> Any:
+        tree = self.tree
+        index = self.index
+        sequence_type = tree.kind_fields[tree.kinds[index]].get(name, False)
+        if sequence_type is False:
+            raise AttributeError(f'{self.node_type.__name__} has no field {name!r}')
+        field = tree._field_ids.get(name, -1)
+        fields = tree.fields
+        children = [NodeView(tree, c) for c in tree.iter_children(index) if fields[c] == field]
+        if sequence_type is not None:
+            return tuple(children)
+        if children:
+            return children[0]
+        return dict(tree.interned[tree.values[index]])[name]
+
+    def to_node(self) -> Node:
+        """
+        Build the equivalent :class:`~ahk_ast.model.Node` tree
+        """
+        tree = self.tree
+        kind = tree.kinds[self.index]
+        state: dict[str, Any] = dict(tree.interned[tree.values[self.index]])
+        sequences: dict[str, list[Node]] = {}
+        for name, sequence_type in tree.kind_fields[kind].items():
+            if sequence_type is not None:
+                sequences[name] = []
+        for child in self.children():
+            name = tree.field_names[tree.fields[child.index]]
+            if name in sequences:
+                sequences[name].append(child.to_node())
+            else:
+                state[name] = child.to_node()
+        for name, items in sequences.items():
+            state[name] = tree.kind_fields[kind][name](items)  # type: ignore[misc]
+        node_type = tree.kind_types[kind]
+        node = node_type.__new__(node_type)
+        # restore attributes in their original order
+        node.__dict__.update(
+            (name, state[name]) for name in tree.kind_fields[kind] if name in state
+        )
+        return node
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, NodeView):
+            return NotImplemented
+        return self.tree is other.tree and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self) -> str:
+        return f'NodeView({self.node_type.__name__}, index={self.index})'
+
+
+def _scan(
+    column: Union['array[int]', memoryview], itemsize: int, fmt: str, values: Collection[int]
+) -> list[int]:
+    """
+    Indexes of the items of ``column`` that are in ``values``, in order, found with a single
+    regex search over the raw buffer (which is not copied)
+    """
+    if not values:
+        return []
+    needles = b'|'.join(re.escape(struct.pack(fmt, value)) for value in values)
+    search = re.compile(b'(?s)' + needles).search
+    indexes = []
+    with memoryview(column) as view, view.cast('B') as data:
+        found = search(data)
+        while found is not None:
+            pos = found.start()
+            if pos % itemsize == 0:
+                indexes.append(pos // itemsize)
+                found = search(data, pos + itemsize)
+            else:
+                # match straddles two items
+                found = search(data, pos + 1)
+    return indexes
+
+
+class ColumnarTree:
+    """
+    Struct-of-arrays storage for one or more programs.
+
+    Example::
+
+        tree = ColumnarTree()
+        for path in paths:
+            tree.parse(open(path).read())
+        for call in tree.function_calls('Run'):
+            print(call.arguments)
+    """
+
+    def __init__(self) -> None:
+        self.kinds = array('B')
+        self.parents = array('i')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.fields = array('H')
+        self.values = array('i')
+        self.roots = array('i')
+        self.kind_types: list[type[Node]] = []
+        # per kind: field name -> sequence type (tuple or list), or None for single-valued fields
+        self.kind_fields: list[dict[str, Optional[type]]] = []
+        self.field_names: list[str] = []
+        self.interned: list[Payload] = []
+        self._kind_ids: dict[type[Node], int] = {}
+        self._field_ids: dict[str, int] = {}
+        self._intern_ids: dict[tuple[Any, ...], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> NodeView:
+        if not -len(self.kinds) <= index < len(self.kinds):
+            raise IndexError(index)
+        return NodeView(self, index % len(self.kinds))
+
+    def _kind_id(self, node_type: type[Node]) -> int:
+        kind = self._kind_ids.get(node_type)
+        if kind is None:
+            kind = self._kind_ids[node_type] = len(self.kind_types)
+            self.kind_types.append(node_type)
+            self.kind_fields.append({})
+        return kind
+
+    def _field_id(self, name: str) -> int:
+        field = self._field_ids.get(name)
+        if field is None:
+            field = self._field_ids[name] = len(self.field_names)
+            self.field_names.append(name)
+        return field
+
+    def _intern(self, payload: Payload) -> int:
+        key = tuple((name, type(value), value) for name, value in payload)
+        value_id = self._intern_ids.get(key)
+        if value_id is None:
+            value_id = self._intern_ids[key] = len(self.interned)
+            self.interned.append(payload)
+        return value_id
+
+    def add(self, root: Node) -> NodeView:
+        """
+        Append the tree rooted at ``root`` and return a view of its root
+        """
+        kinds = self.kinds
+        parents = self.parents
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        root_index = len(kinds)
+        last_child: dict[int, int] = {}
+        stack: list[tuple[Node, int, int]] = [(root, -1, 0)]
+        while stack:
+            node, parent, field = stack.pop()
+            index = len(kinds)
+            kind = self._kind_id(type(node))
+            kind_fields = self.kind_fields[kind]
+            kinds.append(kind)
+            parents.append(parent)
+            first_child.append(-1)
+            next_sibling.append(-1)
+            self.fields.append(field)
+            if parent != -1:
+                previous = last_child.get(parent)
+                if previous is None:
+                    first_child[parent] = index
+                else:
+                    next_sibling[previous] = index
+                last_child[parent] = index
+
+            payload = []
+            children: list[tuple[Node, int]] = []
+            for name, value in iter_fields(node):
+                if isinstance(value, Node):
+                    kind_fields.setdefault(name, None)
+                    children.append((value, self._field_id(name)))
+                elif isinstance(value, (list, tuple)) and all(isinstance(v, Node) for v in value):
+                    kind_fields[name] = type(value)
+                    field_id = self._field_id(name)
+                    children.extend((item, field_id) for item in value)
+                else:
+                    kind_fields.setdefault(name, None)
+                    payload.append((name, value))
+            self.values.append(self._intern(tuple(payload)))
+            stack.extend((child, index, field_id) for child, field_id in reversed(children))
+        self.roots.append(root_index)
+        return NodeView(self, root_index)
+
+    def parse(self, text: str) -> NodeView:
+        """
+        Parse ``text`` and append the resulting program.
+
+        The parser still builds regular nodes for the document; they are released once copied
+        into the arrays.
+        """
+        return self.add(parse(text))
+
+    def iter_children(self, index: int) -> Iterator[int]:
+        child = self.first_child[index]
+        next_sibling = self.next_sibling
+        while child != -1:
+            yield child
+            child = next_sibling[child]
+
+    def indexes_of(self, node_type: type[Node]) -> list[int]:
+        """
+        Indexes of all nodes that are instances of ``node_type`` (including subclasses)
+        """
+        kinds = [
+            kind
+            for kind, kind_type in enumerate(self.kind_types)
+            if issubclass(kind_type, node_type)
+        ]
+        return _scan(self.kinds, 1, 'B', kinds)
+
+    def find(self, node_type: type[Node], **values: Any) -> list[NodeView]:
+        """
+        All nodes of ``node_type`` whose non-node attributes equal ``values``, e.g.
+        ``tree.find(Identifier, name='MsgBox')``
+        """
+        if not values:
+            return [NodeView(self, i) for i in self.indexes_of(node_type)]
+        wanted = values.items()
+        value_ids = set()
+        for value_id, payload in enumerate(self.interned):
+            attrs = dict(payload)
+            if all(name in attrs and attrs[name] == value for name, value in wanted):
+                value_ids.add(value_id)
+        matches = _scan(self.values, self.values.itemsize, 'i', value_ids)
+        kind_types = self.kind_types
+        kinds = self.kinds
+        return [NodeView(self, i) for i in matches if issubclass(kind_types[kinds[i]], node_type)]
+
+    def function_calls(self, name: str) -> list[NodeView]:
+        """
+        All :class:`~ahk_ast.model.FunctionCall` nodes (including statements) that call the
+        function named ``name``
+        """
+        field = self._field_ids.get('func_location')
+        if field is None:
+            return []
+        kind_types = self.kind_types
+        kinds = self.kinds
+        parents = self.parents
+        fields = self.fields
+        calls = []
+        for identifier in self.find(Identifier, name=name):
+            index = identifier.index
+            parent = parents[index]
+            if (
+                parent != -1
+                and fields[index] == field
+                and issubclass(kind_types[kinds[parent]], FunctionCall)
+            ):
+                calls.append(NodeView(self, parent))
+        return calls
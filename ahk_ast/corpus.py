@@ -0,0 +1,192 @@
+"""
+Pack many scripts into one memory-mapped archive and tokenize or parse them in a single pass.
+
+Opening, reading and decoding thousands of small files (and building a lexer for each) costs
+more than tokenizing them. :func:`pack` concatenates the files into one archive; a
+:class:`Corpus` maps it once and decodes each script straight from the mapping, and
+:meth:`Corpus.tokenize_all` and :meth:`Corpus.parse_all` reuse a single lexer and parser for
+every file.
+
+Archive layout (little endian)::
+
+    header   magic b'AHKC', version (uint32), index offset (uint64)
+    data     the raw UTF-8 bytes of each file, back to back
+    index    entry count (uint32), then per entry: offset (uint64), length (uint64),
+             path length (uint16), path (UTF-8)
+"""
+import argparse
+import mmap
+import struct
+import sys
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+from .batch import expand_paths
+from .errors import AHKAstBaseException
+from .errors import AHKCorpusError
+from .model import Node
+from .parser import get_parser
+from .tokenizer import AHKLexer
+from .tokenizer import AHKToken
+
+MAGIC = b'AHKC'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sIQ')
+_COUNT = struct.Struct('<I')
+_ENTRY = struct.Struct('<QQH')
+
+
+class CorpusEntry(NamedTuple):
+    path: str
+    #: position of the file's bytes in the archive
+    offset: int
+    length: int
+
+
+class CorpusResult(NamedTuple):
+    path: str
+    result: Union[list[AHKToken], Node, None]
+    error: Optional[Exception]
+
+
+def pack(paths: Iterable[str], archive: str) -> int:
+    """
+    Write the files in ``paths`` to a new archive at ``archive``. Returns the number of files.
+    """
+    index = []
+    with open(archive, 'wb') as out:
+        out.write(_HEADER.pack(MAGIC, VERSION, 0))
+        offset = _HEADER.size
+        for path in paths:
+            with open(path, 'rb') as f:
+                data = f.read()
+            out.write(data)
+            index.append((path.encode('utf-8'), offset, len(data)))
+            offset += len(data)
+        out.write(_COUNT.pack(len(index)))
+        for encoded_path, entry_offset, length in index:
+            out.write(_ENTRY.pack(entry_offset, length, len(encoded_path)))
+            out.write(encoded_path)
+        out.seek(0)
+        out.write(_HEADER.pack(MAGIC, VERSION, offset))
+    return len(index)
+
+
+class Corpus:
+    """
+    A memory-mapped archive written by :func:`pack`.
+
+    Example::
+
+        with Corpus('scripts.ahkc') as corpus:
+            for path, program, error in corpus.parse_all():
+                ...
+    """
+
+    def __init__(self, archive: str):
+        self.archive = archive
+        with open(archive, 'rb') as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                # empty file
+                raise AHKCorpusError(f'{archive!r} is not a valid corpus archive ({e})') from e
+        try:
+            self.entries = self._read_index()
+        except (struct.error, UnicodeDecodeError) as e:
+            self.close()
+            raise AHKCorpusError(f'{archive!r} is not a valid corpus archive ({e})') from e
+        except AHKCorpusError:
+            self.close()
+            raise
+
+    def _read_index(self) -> list[CorpusEntry]:
+        data = self._mmap
+        magic, version, position = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise AHKCorpusError(f'{self.archive!r} is not a corpus archive')
+        if version != VERSION:
+            raise AHKCorpusError(f'Unsupported corpus archive version {version}')
+        (count,) = _COUNT.unpack_from(data, position)
+        position += _COUNT.size
+        entries = []
+        for _ in range(count):
+            offset, length, path_length = _ENTRY.unpack_from(data, position)
+            position += _ENTRY.size
+            path = str(data[position : position + path_length], 'utf-8')
+            position += path_length
+            entries.append(CorpusEntry(path, offset, length))
+        return entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[CorpusEntry]:
+        return iter(self.entries)
+
+    def text(self, entry: Union[int, CorpusEntry]) -> str:
+        """
+        Decode one file's text directly from the mapping
+        """
+        if isinstance(entry, int):
+            entry = self.entries[entry]
+        with memoryview(self._mmap) as view:
+            with view[entry.offset : entry.offset + entry.length] as window:
+                return str(window, 'utf-8')
+
+    def tokenize_all(self) -> Iterator[CorpusResult]:
+        """
+        Yield ``(path, tokens, error)`` for every file, using one lexer throughout
+        """
+        lexer = AHKLexer()
+        for entry in self.entries:
+            try:
+                tokens = list(lexer.tokenize(self.text(entry)))
+            except (UnicodeDecodeError, AHKAstBaseException) as e:
+                yield CorpusResult(entry.path, None, e)
+            else:
+                yield CorpusResult(entry.path, tokens, None)
+
+    def parse_all(self) -> Iterator[CorpusResult]:
+        """
+        Yield ``(path, program, error)`` for every file, using one lexer and parser throughout
+        """
+        lexer = AHKLexer()
+        parser = get_parser()
+        for entry in self.entries:
+            try:
+                program = parser.parse(lexer.tokenize(self.text(entry)))
+            except (UnicodeDecodeError, AHKAstBaseException) as e:
+                yield CorpusResult(entry.path, None, e)
+            else:
+                yield CorpusResult(entry.path, program, None)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> 'Corpus':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m ahk_ast.corpus', description='Pack AutoHotkey files into a corpus archive.'
+    )
+    arg_parser.add_argument('archive')
+    arg_parser.add_argument('paths', nargs='+', help='files or glob patterns')
+    args = arg_parser.parse_args(argv)
+    count = pack(expand_paths(args.paths), args.archive)
+    print(f'packed {count} files into {args.archive}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
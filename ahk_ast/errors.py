@@ -28,6 +28,7 @@ class AHKTokenizeError(AHKDecodeError):
         lineno = getattr(token, 'lineno', 0)
         index = getattr(token, 'index', 0)
         doc = getattr(token, 'doc', None)
+        self._raw_msg = msg
         self.token = token
         self.index = index
         if token and doc:
@@ -39,7 +40,7 @@ class AHKTokenizeError(AHKDecodeError):
             self.lineno = lineno
 
     def __reduce__(self):  # type: ignore
-        return self.__class__, (self.msg, self.token)
+        return self.__class__, (self._raw_msg, self.token)
 
 
 class AHKParsingException(AHKDecodeError):
@@ -47,6 +48,7 @@ class AHKParsingException(AHKDecodeError):
         lineno = getattr(token, 'lineno', 0)
         index = getattr(token, 'index', 0)
         doc = getattr(token, 'doc', None)
+        self._raw_msg = msg
         self.token = token
         self.index = index
         if token and doc:
@@ -58,8 +60,69 @@ class AHKParsingException(AHKDecodeError):
             self.lineno = lineno
 
     def __reduce__(self):  # type: ignore
-        return self.__class__, (self.msg, self.token)
+        return self.__class__, (self._raw_msg, self.token)
 
 
 class InvalidHotkeyException(AHKParsingException):
     ...
+
+
+class AHKPatternError(ValueError, AHKAstBaseException):
+    ...
+
+
+class AHKFormatError(ValueError, AHKAstBaseException):
+    ...
+
+
+class AHKCorpusError(ValueError, AHKAstBaseException):
+    ...
+
+
+class AHKFrozenNodeError(AttributeError, AHKAstBaseException):
+    ...
+
+
+class AHKBudgetExceededError(AHKAstBaseException):
+    """
+    Raised when a parse exceeds a limit of its :class:`~ahk_ast.budget.Budget`. Records how far
+    it got: the tokens consumed, the index and line of the last one, and the seconds elapsed.
+    """
+
+    def __init__(
+        self,
+        limit: str,
+        value: Union[int, float],
+        tokens: int = 0,
+        index: int = 0,
+        lineno: int = 0,
+        elapsed: float = 0.0,
+    ):
+        super().__init__(
+            f'{limit} budget of {value} exceeded after {tokens} tokens '
+            f'(line {lineno}, index {index}, {elapsed:.3f}s)'
+        )
+        self.limit = limit
+        self.value = value
+        self.tokens = tokens
+        self.index = index
+        self.lineno = lineno
+        self.elapsed = elapsed
+
+    def __reduce__(self):  # type: ignore
+        return self.__class__, (
+            self.limit,
+            self.value,
+            self.tokens,
+            self.index,
+            self.lineno,
+            self.elapsed,
+        )
+
+
+class AHKEvaluationError(ValueError, AHKAstBaseException):
+    ...
+
+
+class AHKSharedMemoryError(ValueError, AHKAstBaseException):
+    ...
@@ -0,0 +1,342 @@
+"""
+Constant folding and evaluation of expressions.
+
+:func:`fold` returns a tree in which every operation on literals has been replaced by its
+result. :func:`compile_expression` folds an expression and turns it into a Python closure that
+takes an environment (a mapping of variable names to values), so an expression evaluated many
+times is only walked once:
+
+    value_of = compile_expression(assignment.value)
+    value_of({'width': 800})
+
+The semantics follow AHK v2 for the values the model can express: numeric strings are numbers in
+arithmetic and comparisons, ``/`` always gives a float, ``=`` and ``!=`` compare strings
+case-insensitively while ``==`` and ``!==`` are case-sensitive, ``&&`` and ``||`` short-circuit
+and return the operand that decided the result, and ``""``, ``0`` and ``"0"`` are false.
+Variable names are case-insensitive: a name that is not in the environment as written is looked
+up ignoring case. Integers are not wrapped to 64 bits.
+"""
+import math
+import operator
+from collections.abc import Mapping
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Union
+
+import regex as re  # type: ignore[import]
+
+from .errors import AHKEvaluationError
+from .model import *
+
+Environment = Mapping[str, Any]
+Compiled = Callable[[Environment], Any]
+Number = Union[int, float]
+
+_INTEGER = re.compile(r'\s*([+-]?)(?:0[xX]([0-9a-fA-F]+)|(\d+))\s*')
+_FLOAT = re.compile(r'\s*[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?\s*')
+
+_LITERALS = (Integer, Float, Bool, String)
+
+_EMPTY_ENVIRONMENT: Environment = {}
+
+
+def _parse_number(text: str) -> Optional[Number]:
+    match = _INTEGER.fullmatch(text)
+    if match is not None:
+        sign, hexadecimal, decimal = match.groups()
+        value = int(hexadecimal, 16) if hexadecimal else int(decimal)
+        return -value if sign == '-' else value
+    if _FLOAT.fullmatch(text):
+        return float(text)
+    return None
+
+
+def _type_name(value: Any) -> str:
+    if isinstance(value, str):
+        return 'String'
+    if isinstance(value, (int, float)):
+        return 'Number'
+    return type(value).__name__
+
+
+def to_number(value: Any) -> Number:
+    """
+    ``value`` as an AHK number; raises :class:`~ahk_ast.errors.AHKEvaluationError` for strings
+    that are not numeric and for other values
+    """
+    if type(value) is int or type(value) is float:
+        return value
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        number = _parse_number(value)
+        if number is not None:
+            return number
+    raise AHKEvaluationError(f'Expected a Number but got {_type_name(value)} {value!r}')
+
+
+def to_string(value: Any) -> str:
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return str(value)
+
+
+def is_true(value: Any) -> bool:
+    if isinstance(value, str):
+        if not value:
+            return False
+        number = _parse_number(value)
+        return number is None or number != 0
+    return bool(value)
+
+
+def _numbers(left: Any, right: Any) -> Optional[tuple[Number, Number]]:
+    """
+    Both operands as numbers if both are numeric, for comparisons
+    """
+    if isinstance(left, str):
+        left = _parse_number(left)
+        if left is None:
+            return None
+    if isinstance(right, str):
+        right = _parse_number(right)
+        if right is None:
+            return None
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        return left, right
+    return None
+
+
+def _divide(left: Any, right: Any) -> float:
+    divisor = to_number(right)
+    if divisor == 0:
+        raise AHKEvaluationError('Divide by zero')
+    return to_number(left) / divisor
+
+
+def _arithmetic(function: Callable[[Number, Number], Number]) -> Callable[[Any, Any], Number]:
+    def apply(left: Any, right: Any) -> Number:
+        return function(to_number(left), to_number(right))
+
+    return apply
+
+
+def _ordering(function: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    # numbers compare numerically; otherwise alphabetically, ignoring case
+    def apply(left: Any, right: Any) -> bool:
+        numbers = _numbers(left, right)
+        if numbers is not None:
+            return function(*numbers)
+        return function(to_string(left).lower(), to_string(right).lower())
+
+    return apply
+
+
+def _equal(left: Any, right: Any) -> bool:
+    numbers = _numbers(left, right)
+    if numbers is not None:
+        return numbers[0] == numbers[1]
+    return to_string(left).lower() == to_string(right).lower()
+
+
+def _identical(left: Any, right: Any) -> bool:
+    numbers = _numbers(left, right)
+    if numbers is not None:
+        return numbers[0] == numbers[1]
+    return to_string(left) == to_string(right)
+
+
+_BINARY_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    '+': _arithmetic(operator.add),
+    '-': _arithmetic(operator.sub),
+    '*': _arithmetic(operator.mul),
+    '/': _divide,
+    '<': _ordering(operator.lt),
+    '<=': _ordering(operator.le),
+    '>': _ordering(operator.gt),
+    '>=': _ordering(operator.ge),
+    '=': _equal,
+    '==': _identical,
+    '!=': lambda left, right: not _equal(left, right),
+    '!==': lambda left, right: not _identical(left, right),
+}
+
+_UNARY_OPERATORS: dict[str, Callable[[Any], Any]] = {
+    '-': lambda operand: -to_number(operand),
+    '+': to_number,
+    '!': lambda operand: not is_true(operand),
+}
+
+
+def _lookup(environment: Environment, name: str) -> Any:
+    try:
+        return environment[name]
+    except KeyError:
+        pass
+    folded = name.lower()
+    for key, value in environment.items():
+        if key.lower() == folded:
+            return value
+    raise AHKEvaluationError(f'Variable {name!r} has not been assigned a value')
+
+
+class Compiler:
+    """
+    Compiles expression nodes into closures over an environment. Dispatches on the node's class
+    (or the nearest base class) to a ``_compile_<ClassName>`` method.
+    """
+
+    def __init__(self) -> None:
+        self._handlers: dict[type, Callable[[Any], Compiled]] = {}
+
+    def compile(self, node: Node) -> Compiled:
+        handler = self._handlers.get(type(node))
+        if handler is None:
+            handler = self._handlers[type(node)] = self._find_handler(type(node))
+        return handler(node)
+
+    def _find_handler(self, node_type: type) -> Callable[[Any], Compiled]:
+        for cls in node_type.__mro__:
+            handler = getattr(self, f'_compile_{cls.__name__}', None)
+            if handler is not None:
+                return handler  # type: ignore[no-any-return]
+        raise AHKEvaluationError(f'Cannot evaluate {node_type.__name__} nodes')
+
+    def _compile_Integer(self, node: Integer) -> Compiled:
+        value = node.value
+        return lambda environment: value
+
+    _compile_Float = _compile_Integer
+    _compile_Bool = _compile_Integer
+
+    def _compile_String(self, node: String) -> Compiled:
+        value = node.unescaped_value
+        return lambda environment: value
+
+    def _compile_Identifier(self, node: Identifier) -> Compiled:
+        name = node.name
+        return lambda environment: _lookup(environment, name)
+
+    def _compile_FieldLookup(self, node: FieldLookup) -> Compiled:
+        location = self.compile(node.location)
+        fieldname = node.fieldname
+
+        def field(environment: Environment) -> Any:
+            value = location(environment)
+            if isinstance(value, Mapping):
+                return _lookup(value, fieldname)
+            try:
+                return getattr(value, fieldname)
+            except AttributeError:
+                raise AHKEvaluationError(
+                    f'{_type_name(value)} has no property {fieldname!r}'
+                ) from None
+
+        return field
+
+    def _compile_Grouping(self, node: Grouping) -> Compiled:
+        return self.compile(node.expression)
+
+    def _compile_UnaryOp(self, node: UnaryOp) -> Compiled:
+        function = _UNARY_OPERATORS[node.op]
+        operand = self.compile(node.operand)
+        return lambda environment: function(operand(environment))
+
+    def _compile_BinOp(self, node: BinOp) -> Compiled:
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+        if node.op == '&&':
+            return lambda environment: (
+                right(environment) if is_true(value := left(environment)) else value
+            )
+        if node.op == '||':
+            return lambda environment: (
+                value if is_true(value := left(environment)) else right(environment)
+            )
+        function = _BINARY_OPERATORS[node.op]
+        return lambda environment: function(left(environment), right(environment))
+
+    def _compile_FunctionCall(self, node: FunctionCall) -> Compiled:
+        location = self.compile(node.func_location)
+        arguments = tuple(self.compile(argument) for argument in node.arguments)
+
+        def call(environment: Environment) -> Any:
+            function = location(environment)
+            if not callable(function):
+                raise AHKEvaluationError(f'{_type_name(function)} {function!r} is not callable')
+            return function(*(argument(environment) for argument in arguments))
+
+        return call
+
+
+_compiler = Compiler()
+
+
+def _literal(value: Any) -> Optional[Expression]:
+    """
+    A literal node for the result of an operator (always a number or a bool), or None if the
+    model cannot express it
+    """
+    if isinstance(value, bool):
+        return Bool(value)
+    if isinstance(value, int):
+        return Integer(value)
+    if isinstance(value, float) and math.isfinite(value):
+        return Float(value)
+    return None
+
+
+def _fold_value(value: Any) -> Any:
+    if isinstance(value, Node):
+        return fold(value)
+    if isinstance(value, (list, tuple)):
+        folded = [_fold_value(item) for item in value]
+        if any(new is not old for new, old in zip(folded, value)):
+            return type(value)(folded)
+    return value
+
+
+def fold(node: Node) -> Node:
+    """
+    Return ``node`` with its constant subexpressions replaced by literals. Subtrees that do not
+    change are returned as they are, so folding never modifies ``node`` and works on frozen trees.
+    Operations that would fail at run time (such as dividing by zero) are left in place.
+    """
+    fields = {key: _fold_value(value) for key, value in iter_fields(node)}
+    if any(value is not node.__dict__[key] for key, value in fields.items()):
+        node = type(node)._from_parser(**fields)
+
+    if isinstance(node, Grouping) and isinstance(node.expression, _LITERALS):
+        return node.expression
+    if isinstance(node, BinOp) and node.op in ('&&', '||') and isinstance(node.left, _LITERALS):
+        decided = is_true(_compiler.compile(node.left)(_EMPTY_ENVIRONMENT)) == (node.op == '||')
+        return node.left if decided else node.right
+    if isinstance(node, (UnaryOp, BinOp)) and all(
+        isinstance(child, _LITERALS) for child in iter_child_nodes(node)
+    ):
+        try:
+            value = _compiler.compile(node)(_EMPTY_ENVIRONMENT)
+        except AHKEvaluationError:
+            return node
+        return _literal(value) or node
+    return node
+
+
+def compile_expression(node: Expression) -> Compiled:
+    """
+    Fold ``node`` and compile it into a function of an environment that returns its value.
+    Raises :class:`~ahk_ast.errors.AHKEvaluationError` for nodes that cannot be evaluated
+    (such as statements).
+    """
+    return _compiler.compile(fold(node))
+
+
+def evaluate(node: Expression, environment: Optional[Environment] = None) -> Any:
+    """
+    The value of ``node`` in ``environment``. Compiles ``node`` on every call; to evaluate the
+    same expression repeatedly, call :func:`compile_expression` once instead.
+    """
+    return compile_expression(node)(_EMPTY_ENVIRONMENT if environment is None else environment)
@@ -0,0 +1,407 @@
+"""
+AHK source printer for AST nodes.
+
+Nodes are first converted to a document (plain strings, lists and the ``LINE``, ``SOFTLINE``,
+``HARDLINE``, ``group`` and ``nest`` combinators), which is then laid out in one pass over a list
+buffer. Line-width decisions follow Wadler's "prettier printer" (as in Lindig's strict
+formulation): a group is printed on one line if its contents, up to the next possible line break
+after it, fit in the remaining width; otherwise each of its line breaks becomes a newline. Checking
+whether a group fits stops after at most ``width`` characters, so layout is linear in the size of
+the document.
+
+Lines are only broken where the parser reads them back as one line (AHK's continuation rules): a
+call's arguments may break inside the parentheses, and command-style arguments continue on lines
+that start with ``,``. Binary operations are kept on one line, with parentheses added where
+AHK's operator precedence would otherwise group the operands differently.
+
+:func:`format_source` refuses to format a script whose formatted output would not have the same
+tokens, apart from whitespace and line breaks, as the original: the AST does not yet record
+everything that matters, such as empty arguments.
+"""
+import argparse
+import math
+import sys
+from decimal import Decimal
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+from .errors import AHKAstBaseException
+from .errors import AHKFormatError
+from .model import *
+from .parser import parse_tokens
+from .tokenizer import AHKToken
+from .tokenizer import tokenize
+
+Doc = Union[str, list[Any], tuple[Any, ...]]
+
+#: a space, or a newline if the enclosing group does not fit
+LINE = ('line', ' ')
+#: nothing, or a newline if the enclosing group does not fit
+SOFTLINE = ('line', '')
+#: always a newline
+HARDLINE = ('hardline',)
+
+_FLAT = 0
+_BREAK = 1
+
+_Item = tuple[int, int, Doc]
+
+# binding strength of the binary operators; all of them are left-associative
+_PRECEDENCE = {
+    '||': 1,
+    '&&': 2,
+    '=': 3,
+    '==': 3,
+    '!=': 3,
+    '!==': 3,
+    '<': 4,
+    '<=': 4,
+    '>': 4,
+    '>=': 4,
+    '+': 5,
+    '-': 5,
+    '*': 6,
+    '/': 6,
+}
+_UNARY_PRECEDENCE = 7
+
+
+def group(*docs: Doc) -> Doc:
+    return ('group', list(docs))
+
+
+def nest(*docs: Doc) -> Doc:
+    """
+    Indent the lines started inside ``docs`` by one level
+    """
+    return ('nest', list(docs))
+
+
+def join(separator: Doc, docs: Sequence[Doc]) -> list[Doc]:
+    joined: list[Doc] = []
+    for i, doc in enumerate(docs):
+        if i:
+            joined.append(separator)
+        joined.append(doc)
+    return joined
+
+
+def _fits(width: int, item: _Item, rest: list[_Item]) -> bool:
+    """
+    Whether ``item``, printed flat, and what follows it up to the next line break fit in ``width``
+    """
+    items = [item]
+    rest_index = len(rest)
+    while width >= 0:
+        if not items:
+            if rest_index == 0:
+                return True
+            rest_index -= 1
+            items.append(rest[rest_index])
+        level, mode, doc = items.pop()
+        if type(doc) is str:
+            newline = doc.find('\n')
+            if newline != -1:
+                return newline <= width
+            width -= len(doc)
+        elif type(doc) is list:
+            items.extend((level, mode, d) for d in reversed(doc))
+        else:
+            tag = doc[0]
+            if tag == 'line':
+                if mode == _BREAK:
+                    return True
+                width -= len(doc[1])
+            elif tag == 'hardline':
+                return mode == _BREAK
+            else:
+                items.append((level, mode, doc[1]))
+    return False
+
+
+def render(doc: Doc, width: int = 100, indent: int = 4) -> str:
+    """
+    Lay out ``doc`` in at most ``width`` columns where possible
+    """
+    out: list[str] = []
+    append = out.append
+    column = 0
+    stack: list[_Item] = [(0, _BREAK, doc)]
+    pop = stack.pop
+    while stack:
+        level, mode, doc = pop()
+        if type(doc) is str:
+            append(doc)
+            newline = doc.rfind('\n')
+            column = column + len(doc) if newline == -1 else len(doc) - newline - 1
+        elif type(doc) is list:
+            stack.extend((level, mode, d) for d in reversed(doc))
+        else:
+            tag = doc[0]
+            if tag == 'line' and mode == _FLAT:
+                append(doc[1])
+                column += len(doc[1])
+            elif tag == 'line' or tag == 'hardline':
+                append('\n')
+                append(' ' * level)
+                column = level
+            elif tag == 'nest':
+                stack.append((level + indent, mode, doc[1]))
+            elif mode == _FLAT or _fits(width - column, (level, _FLAT, doc[1]), stack):
+                stack.append((level, _FLAT, doc[1]))
+            else:
+                stack.append((level, _BREAK, doc[1]))
+    return ''.join(out)
+
+
+class Formatter:
+    """
+    Converts nodes to documents. Each node type is handled by the ``_format_<ClassName>`` method
+    of its class or nearest base class.
+    """
+
+    def __init__(self, width: int = 100, indent: int = 4):
+        self.width = width
+        self.indent = indent
+        self._handlers: dict[type, Callable[[Any], Doc]] = {}
+
+    def format(self, node: Node) -> str:
+        return render(self.doc(node), self.width, self.indent)
+
+    def doc(self, node: Node) -> Doc:
+        handler = self._handlers.get(type(node))
+        if handler is None:
+            handler = self._handlers[type(node)] = self._find_handler(type(node))
+        return handler(node)
+
+    def _find_handler(self, node_type: type) -> Callable[[Any], Doc]:
+        for cls in node_type.__mro__:
+            handler = getattr(self, f'_format_{cls.__name__}', None)
+            if handler is not None:
+                return handler  # type: ignore[no-any-return]
+        raise AHKFormatError(f'Cannot format {node_type.__name__} nodes')
+
+    def _field(self, node: Node, name: str) -> Any:
+        try:
+            return node.__dict__[name]
+        except KeyError:
+            raise AHKFormatError(
+                f'Cannot format {type(node).__name__} without {name!r}: {node!r}'
+            ) from None
+
+    def _statements(self, statements: Sequence[Statement]) -> list[Doc]:
+        return join(HARDLINE, [self.doc(statement) for statement in statements])
+
+    def _format_Program(self, node: Program) -> Doc:
+        if not node.statements:
+            return ''
+        return [*self._statements(node.statements), HARDLINE]
+
+    def _format_Block(self, node: Block) -> Doc:
+        if not node.statements:
+            return '{}'
+        return ['{', nest(HARDLINE, *self._statements(node.statements)), HARDLINE, '}']
+
+    def _format_Assignment(self, node: Assignment) -> Doc:
+        return [self.doc(node.location), ' := ', self.doc(node.value)]
+
+    def _format_AugmentedAssignment(self, node: AugmentedAssignment) -> Doc:
+        op = self._field(node, 'op')
+        return [self.doc(node.location), f' {op}= ', self.doc(node.value)]
+
+    def _format_FunctionCall(self, node: FunctionCall) -> Doc:
+        func = self.doc(node.func_location)
+        if not node.arguments:
+            return [func, '()']
+        arguments = join([',', LINE], [self.doc(argument) for argument in node.arguments])
+        return group(func, '(', nest(SOFTLINE, *arguments), SOFTLINE, ')')
+
+    def _format_FunctionCallStatement(self, node: FunctionCallStatement) -> Doc:
+        func = self.doc(node.func_location)
+        if not node.arguments:
+            return func
+        first, *rest = [self.doc(argument) for argument in node.arguments]
+        return group(func, ' ', first, nest(*[[SOFTLINE, ', ', argument] for argument in rest]))
+
+    def _format_IfStatement(self, node: IfStatement) -> Doc:
+        doc = ['if ', self.doc(node.condition), ' ', self.doc(node.consequent)]
+        if node.alternative is not None:
+            doc += [' else ', self.doc(node.alternative)]
+        return doc
+
+    def _format_WhileLoop(self, node: WhileLoop) -> Doc:
+        return ['while ', self.doc(node.condition), ' ', self.doc(node.body)]
+
+    def _format_ForLoop(self, node: ForLoop) -> Doc:
+        expression = self._field(node, 'expression')
+        return ['for ', self.doc(node.location), ' in ', self.doc(expression)]
+
+    def _format_FunctionDefinition(self, node: FunctionDefinition) -> Doc:
+        parameters = join([',', LINE], [self.doc(parameter) for parameter in node.parameters])
+        return [
+            group(node.name, '(', nest(SOFTLINE, *parameters), SOFTLINE, ')'),
+            ' ',
+            self.doc(node.body),
+        ]
+
+    def _format_Parameter(self, node: Parameter) -> Doc:
+        name: str = node.name
+        default_value = node.__dict__.get('default_value')
+        if default_value is None:
+            return name
+        return [name, ' := ', self.doc(default_value)]
+
+    def _format_ReturnStatement(self, node: ReturnStatement) -> Doc:
+        if node.expression is None:
+            return 'return'
+        return ['return ', self.doc(node.expression)]
+
+    def _format_BreakStatement(self, node: BreakStatement) -> Doc:
+        return 'break'
+
+    def _format_ContinueStatement(self, node: ContinueStatement) -> Doc:
+        return 'continue'
+
+    def _format_Hotkey(self, node: Hotkey) -> Doc:
+        modifiers: str = node.modifiers or ''
+        keyname: str = node.keyname
+        return modifiers + keyname
+
+    def _format_HotkeyDefinition(self, node: HotkeyDefinition) -> Doc:
+        hotkey = self.doc(node.hotkey)
+        if node.second_hotkey is not None:
+            hotkey = [hotkey, ' & ', self.doc(node.second_hotkey)]
+        return [hotkey, '::', self.doc(node.action)]
+
+    def _format_Identifier(self, node: Identifier) -> Doc:
+        name: str = node.name
+        return name
+
+    def _format_FieldLookup(self, node: FieldLookup) -> Doc:
+        return [self.doc(node.location), '.', node.fieldname]
+
+    def _format_Integer(self, node: Integer) -> Doc:
+        return str(node.value)
+
+    def _format_Float(self, node: Float) -> Doc:
+        value: float = node.value
+        if not math.isfinite(value):
+            raise AHKFormatError(f'{value} has no AHK literal')
+        # AHK float literals have no exponent
+        text = format(Decimal(repr(value)), 'f')
+        return text if '.' in text else text + '.0'
+
+    def _format_Bool(self, node: Bool) -> Doc:
+        return 'true' if node.value else 'false'
+
+    def _format_String(self, node: String) -> Doc:
+        return f'"{node.value}"'
+
+    def _format_SingleQuotedString(self, node: SingleQuotedString) -> Doc:
+        return f"'{node.value}'"
+
+    def _operand(self, node: Node, precedence: int) -> Doc:
+        """
+        ``node``, parenthesized if it binds less tightly than ``precedence``
+        """
+        if isinstance(node, BinOp) and _PRECEDENCE[node.op] < precedence:
+            return ['(', self.doc(node), ')']
+        return self.doc(node)
+
+    def _format_UnaryOp(self, node: UnaryOp) -> Doc:
+        operand = node.operand
+        signed = (isinstance(operand, UnaryOp) and operand.op in ('+', '-')) or (
+            isinstance(operand, (Integer, Float)) and operand.value < 0
+        )
+        # keep "- -a" from reading as the decrement operator
+        op = f'{node.op} ' if signed and node.op in ('+', '-') else node.op
+        return [op, self._operand(operand, _UNARY_PRECEDENCE)]
+
+    def _format_BinOp(self, node: BinOp) -> Doc:
+        precedence = _PRECEDENCE[node.op]
+        return [
+            self._operand(node.left, precedence),
+            f' {node.op} ',
+            self._operand(node.right, precedence + 1),
+        ]
+
+    def _format_Grouping(self, node: Grouping) -> Doc:
+        return group('(', nest(SOFTLINE, self.doc(node.expression)), SOFTLINE, ')')
+
+
+def format_node(node: Node, width: int = 100, indent: int = 4) -> str:
+    """
+    AHK source for ``node``
+    """
+    return Formatter(width, indent).format(node)
+
+
+def _significant_tokens(tokens: Iterable[AHKToken]) -> list[AHKToken]:
+    return [tok for tok in tokens if tok.type != 'WHITESPACE' and tok.type != 'NEWLINE']
+
+
+def format_source(text: str, width: int = 100, indent: int = 4) -> str:
+    """
+    Parse ``text`` and print it back in canonical form.
+
+    Raises :class:`~ahk_ast.errors.AHKFormatError` if the result would differ from ``text`` in
+    more than whitespace and line breaks, e.g. for ``Run "notepad.exe", , "Max"``, whose empty
+    argument the parser drops.
+    """
+    tokens = list(tokenize(text))
+    formatted = format_node(parse_tokens(tokens), width, indent)
+    before = _significant_tokens(tokens)
+    after = _significant_tokens(tokenize(formatted))
+    for original, new in zip(before, after):
+        if (original.type, original.value) != (new.type, new.value):
+            raise AHKFormatError(
+                f'Formatting would change line {original.lineno}: '
+                f'{original.value!r} would become {new.value!r}'
+            )
+    if len(before) > len(after):
+        dropped = before[len(after)]
+        raise AHKFormatError(f'Formatting would drop {dropped.value!r} from line {dropped.lineno}')
+    if len(after) > len(before):
+        raise AHKFormatError(f'Formatting would add {after[len(before)].value!r}')
+    return formatted
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m ahk_ast.formatter', description='Format AutoHotkey source files.'
+    )
+    arg_parser.add_argument('files', nargs='+')
+    arg_parser.add_argument(
+        '--check', action='store_true', help="report files that would change, but don't write"
+    )
+    arg_parser.add_argument('--width', type=int, default=100)
+    arg_parser.add_argument('--indent', type=int, default=4)
+    args = arg_parser.parse_args(argv)
+
+    status = 0
+    for filename in args.files:
+        with open(filename, encoding='utf-8') as f:
+            text = f.read()
+        try:
+            formatted = format_source(text, args.width, args.indent)
+        except AHKAstBaseException as e:
+            print(f'error: cannot format {filename}: {e}', file=sys.stderr)
+            status = 1
+            continue
+        if formatted == text:
+            continue
+        status = 1
+        if args.check:
+            print(f'would reformat {filename}')
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                f.write(formatted)
+            print(f'reformatted {filename}')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Token spans for syntax highlighting.
+
+:class:`Highlighter` produces ``(start, end, kind)`` triples for a range of lines using the lexer's
+master regex directly: no token objects are built and no per-token callbacks run. It caches the
+lexer state at the start of every line it has passed, so highlighting the visible lines of a
+large file only lexes those lines, and an edit only invalidates the states that could depend on
+the changed text.
+
+For input that :func:`~ahk_ast.tokenizer.tokenize` accepts, the kinds and spans are the same as
+its tokens. Instead of raising on bad input, a character no rule matches is reported as
+``ERROR`` and an unterminated string as ``UNTERMINATED_DOUBLE_QUOTE_STRING`` or
+``UNTERMINATED_SINGLE_QUOTE_STRING`` up to the end of its line.
+"""
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Optional
+
+import regex as re  # type: ignore[import]
+
+from .tokenizer import _scan_block_comment
+from .tokenizer import _scan_quoted_string
+from .tokenizer import _split_keyword_rules
+from .tokenizer import AHKLexer
+
+Span = tuple[int, int, str]
+
+_NAME_CHAR = re.compile(r'[a-zA-Z_\d]')
+
+_RULES, _KEYWORDS, _COMPOUND_KEYWORDS = _split_keyword_rules()
+# the lexer's master regex without the keyword alternatives
+_MASTER_RE = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern in _RULES), AHKLexer.reflags
+)
+
+# how far past the start of a token the master regex may look, e.g. for ``loop count`` plus the
+# keyword lookahead
+_LOOKAHEAD = 16
+
+_UNTERMINATED = {
+    'DOUBLE_QUOTED_STRING': 'UNTERMINATED_DOUBLE_QUOTE_STRING',
+    'SINGLE_QUOTED_STRING': 'UNTERMINATED_SINGLE_QUOTE_STRING',
+}
+
+
+class Highlighter:
+    def __init__(self, text: str):
+        self._match = _MASTER_RE.match
+        self.text = ''
+        self._lines: list[str] = []
+        self._line_starts: list[int] = []
+        # for each line whose state is known: where the token covering the line's start begins
+        self._resume: list[int] = []
+        # and the furthest offset the lexer looked at to determine that (a running maximum)
+        self._horizon: list[int] = []
+        self.set_text(text)
+
+    @property
+    def line_count(self) -> int:
+        return len(self._line_starts)
+
+    def set_text(self, text: str) -> None:
+        """
+        Replace the text, keeping cached line states that the edit cannot have affected
+        """
+        lines = text.split('\n')
+        old_lines = self._lines
+        changed = min(len(old_lines), len(lines))
+        for line, (old, new) in enumerate(zip(old_lines, lines)):
+            if old != new:
+                changed = line
+                break
+        if changed < len(old_lines):
+            first_changed_offset = self._line_starts[changed]
+        else:
+            first_changed_offset = len(self.text)
+        keep = min(bisect_right(self._horizon, first_changed_offset), changed + 1)
+        del self._resume[keep:]
+        del self._horizon[keep:]
+        self.text = text
+        self._comment_end_missing_from = len(text)
+        self._lines = lines
+        self._line_starts = [0, *accumulate(len(line) + 1 for line in lines[:-1])]
+
+    def _step(self, pos: int) -> tuple[int, str, int]:
+        """
+        Lex one token at ``pos``, returning its end, its kind and how far the lexer looked
+        """
+        text = self.text
+        m = self._match(text, pos)
+        if m is None:
+            return pos + 1, 'ERROR', pos + 1
+        kind = m.lastgroup
+        if kind == 'BLOCK_COMMENT':
+            end = -1
+            if pos < self._comment_end_missing_from:
+                end = _scan_block_comment(text, pos)
+                if end == -1:
+                    # no later ``/*`` can be terminated either; see AHKLexer.BLOCK_COMMENT
+                    self._comment_end_missing_from = pos
+            if end == -1:
+                # depends on there being no ``*/`` anywhere up to the end of the text
+                return pos + 1, 'DIVIDE', len(text) + 1
+            return end, kind, end
+        if kind in _UNTERMINATED:
+            end = _scan_quoted_string(text, pos, text[pos])
+            if end == -1:
+                newline = text.find('\n', pos)
+                end = newline if newline != -1 else len(text)
+                return end, _UNTERMINATED[kind], len(text) + 1
+            return end, kind, end
+        end = m.end()
+        if kind == 'NAME':
+            word = text[pos:end].lower()
+            for suffix, compound in _COMPOUND_KEYWORDS.get(word, ()):
+                after = end + len(suffix)
+                if text[end:after].lower() == suffix and not _NAME_CHAR.match(text, after):
+                    return after, compound, after + 1
+            kind = _KEYWORDS.get(word, kind)
+        return end, kind, max(end, pos + _LOOKAHEAD) + 1
+
+    def _lex(self, pos: int, stop: int, out: Optional[list[Span]]) -> None:
+        """
+        Lex from the token boundary ``pos`` until a token starts at or after ``stop``, recording
+        line states along the way and appending spans to ``out``
+        """
+        starts = self._line_starts
+        resume = self._resume
+        horizon = self._horizon
+        seen = horizon[-1] if horizon else 0
+        text_length = len(self.text)
+        while pos < stop and pos < text_length:
+            end, kind, examined = self._step(pos)
+            if examined > seen:
+                seen = examined
+            line = len(resume)
+            while line < len(starts) and starts[line] < end:
+                # this token covers the start of the next line whose state is unknown
+                resume.append(pos)
+                horizon.append(seen)
+                line += 1
+            if out is not None:
+                out.append((pos, end, kind))
+            pos = end
+        if pos >= text_length:
+            # trailing empty line
+            while len(resume) < len(starts):
+                resume.append(text_length)
+                horizon.append(seen)
+
+    def _ensure(self, line: int) -> None:
+        if line >= len(self._resume):
+            pos = self._resume[-1] if self._resume else 0
+            self._lex(pos, self._line_starts[line] + 1, None)
+
+    def highlight(self, first_line: int, last_line: Optional[int] = None) -> list[Span]:
+        """
+        ``(start, end, kind)`` for every token that overlaps lines ``first_line`` to ``last_line``
+        (inclusive, zero based). A token that starts on an earlier line, such as a block comment,
+        is included with its full span.
+        """
+        if last_line is None:
+            last_line = first_line
+        line_count = len(self._line_starts)
+        if not 0 <= first_line <= last_line < line_count:
+            raise IndexError(f'line range {first_line}-{last_line} out of range')
+        self._ensure(first_line)
+        stop = self._line_starts[last_line + 1] if last_line + 1 < line_count else len(self.text)
+        spans: list[Span] = []
+        self._lex(self._resume[first_line], stop, spans)
+        return spans
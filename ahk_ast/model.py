@@ -1,9 +1,16 @@
 from collections.abc import Iterable
 from types import SimpleNamespace as _SimpleNamespace
+from typing import Any
+from typing import Iterator
 from typing import Optional
 from typing import Sequence
+from typing import TypeVar
 from typing import Union
 
+from .errors import AHKFrozenNodeError
+
+_N = TypeVar('_N', bound='Node')
+
 
 class Node(_SimpleNamespace):
     def __eq__(self, other: 'Node') -> bool:  # type: ignore[override]
@@ -15,17 +22,28 @@ class Node(_SimpleNamespace):
             if key not in other.__dict__:
                 print(key)
                 return False
-            if other.__dict__.get(key) != value:
+            other_value = other.__dict__.get(key)
+            # a frozen node holds tuples where a mutable one holds lists
+            if isinstance(value, (list, tuple)) and isinstance(other_value, (list, tuple)):
+                if tuple(other_value) != tuple(value):
+                    print(key)
+                    return False
+            elif other_value != value:
                 print(key)
                 return False
         return True
 
+    def __ne__(self, other: 'Node') -> bool:  # type: ignore[override]
+        # SimpleNamespace.__ne__ would compare private attributes too
+        return not self.__eq__(other)
+
     def __repr__(self) -> str:
         rep = (
             f'{self.__class__.__name__}('
             + ', '.join(
                 '{key}={value}'.format(key=key, value=repr(value))
                 for key, value in self.__dict__.items()
+                if not key.startswith('_')
             )
             + ')'
         )
@@ -38,6 +56,94 @@ class Node(_SimpleNamespace):
             print('WARN: Unexpected error formatting code ', e)
             return rep
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self.__dict__.get('_frozen'):
+            raise AHKFrozenNodeError(f'{self.__class__.__name__} node is frozen')
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if self.__dict__.get('_frozen'):
+            raise AHKFrozenNodeError(f'{self.__class__.__name__} node is frozen')
+        super().__delattr__(name)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Node constructors validate and normalize their arguments, so pickle the
+        # already-normalized attributes and restore them without calling __init__.
+        # Copies (including copy.deepcopy) of frozen nodes are not frozen.
+        state = self.__dict__
+        if '_frozen' in state:
+            state = {key: value for key, value in state.items() if key != '_frozen'}
+        return _rebuild_node, (self.__class__, state)
+
+    @classmethod
+    def _from_parser(cls: type[_N], **fields: Any) -> _N:
+        """
+        Build a node from attributes that are already valid and normalized (e.g. ``arguments``
+        as a tuple), skipping the checks in ``__init__``. Meant for trusted output such as the
+        parser's; nodes built by users should go through the constructor.
+        """
+        node = cls.__new__(cls)
+        node.__dict__.update(fields)
+        return node
+
+
+def _rebuild_node(cls: type[Node], state: dict[str, Any]) -> Node:
+    return cls._from_parser(**state)
+
+
+def iter_fields(node: Node) -> Iterator[tuple[str, Any]]:
+    """
+    Yield ``(name, value)`` for each public attribute of ``node``
+    """
+    for key, value in node.__dict__.items():
+        if not key.startswith('_'):
+            yield key, value
+
+
+def iter_child_nodes(node: Node) -> Iterator[Node]:
+    """
+    Yield the direct children of ``node``: attributes that are nodes, and nodes inside
+    list or tuple attributes
+    """
+    for _, value in iter_fields(node):
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, Node):
+                    yield item
+
+
+def walk(node: Node) -> Iterator[Node]:
+    """
+    Yield ``node`` and all of its descendants, depth first
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(list(iter_child_nodes(node))))
+
+
+def freeze(node: _N) -> _N:
+    """
+    Make ``node`` and all of its descendants read-only, in place, and return it. Setting or
+    deleting an attribute of a frozen node raises :class:`~ahk_ast.errors.AHKFrozenNodeError`,
+    and list attributes (such as ``Block.statements``) become tuples. Use ``copy.deepcopy`` to
+    get a mutable copy; it compares equal to the frozen original.
+    """
+    for descendant in walk(node):
+        state = descendant.__dict__
+        for key, value in state.items():
+            if type(value) is list:
+                state[key] = tuple(value)
+        state['_frozen'] = True
+    return node
+
+
+def is_frozen(node: Node) -> bool:
+    return bool(node.__dict__.get('_frozen'))
+
 
 class Statement(Node):
     ...
@@ -319,11 +425,67 @@ class Grouping(Expression):
         super().__init__(expression=expression)
 
 
+# https://lexikos.github.io/v2/docs/misc/EscapeChar.htm
+_ESCAPE_SEQUENCES = {
+    'n': '\n',
+    'r': '\r',
+    'b': '\b',
+    't': '\t',
+    's': ' ',
+    'v': '\v',
+    'a': '\a',
+    'f': '\f',
+}
+
+
+def unescape(raw: str) -> str:
+    """
+    Decode the backtick escape sequences in the source text of a string literal.
+
+    A backtick followed by any character not in the escape table (such as a quote, ``;`` or
+    another backtick) produces that character.
+    """
+    if '`' not in raw:
+        return raw
+    parts = []
+    pos = 0
+    find = raw.find
+    escape = find('`')
+    while escape != -1 and escape + 1 < len(raw):
+        parts.append(raw[pos:escape])
+        char = raw[escape + 1]
+        parts.append(_ESCAPE_SEQUENCES.get(char, char))
+        pos = escape + 2
+        escape = find('`', pos)
+    parts.append(raw[pos:])
+    return ''.join(parts)
+
+
 class String(Expression):
+    """
+    ``value`` is the source text between the quotes, with escape sequences left as written.
+    """
+
     def __init__(self, value: str):
         assert isinstance(value, str)
         super().__init__(value=value)
 
+    @property
+    def unescaped_value(self) -> str:
+        """
+        The string's value with escape sequences decoded. Computed on first access and cached.
+        """
+        raw: str = self.value
+        if '`' not in raw:
+            return raw
+        cached = self.__dict__.get('_unescaped')
+        if cached is not None and cached[0] is raw:
+            return cached[1]  # type: ignore[no-any-return]
+        unescaped = unescape(raw)
+        # stored under a private key, so it is ignored when comparing nodes
+        self.__dict__['_unescaped'] = (raw, unescaped)
+        return unescaped
+
 
 class DoubleQuotedString(String):
     ...
@@ -0,0 +1,143 @@
+"""
+Tokenize a single large document on several cores.
+
+The document is split into chunks at newlines, the chunks are tokenized in a process pool and
+the results are stitched back together with ``index`` and ``lineno`` corrected, producing
+exactly the same tokens as :func:`ahk_ast.tokenizer.tokenize`.
+"""
+import concurrent.futures
+from typing import Generator
+from typing import Optional
+
+from .errors import AHKTokenizeError
+from .tokenizer import AHKLexer
+from .tokenizer import AHKToken
+from .tokenizer import tokenize
+
+_RawToken = tuple[str, str, int, int]
+
+
+def _find_split_points(text: str, chunk_size: int) -> list[int]:
+    """
+    Pick offsets roughly ``chunk_size`` apart that are just after a newline which is not inside a
+    block comment or (heuristically) a string literal.
+
+    This is only a cheap pre-scan to choose good candidates. ``tokenize_parallel`` verifies every
+    boundary, so a poorly chosen one costs some speed but never changes the output.
+    """
+    find = text.find
+    rfind = text.rfind
+    points = []
+    previous = 0
+    target = chunk_size
+    while target < len(text):
+        newline = find('\n', target)
+        if newline == -1:
+            break
+        comment_start = rfind('/*', previous, newline)
+        if comment_start != -1:
+            comment_end = find('*/', comment_start + 2)
+            if comment_end == -1:
+                break
+            if comment_end > newline:
+                # inside a block comment; try again after it ends
+                target = comment_end + 2
+                continue
+        line = text[rfind('\n', previous, newline) + 1 : newline]
+        if line.count('"') % 2 or line.count("'") % 2:
+            # the line may open a string that continues on the next line
+            target = newline + 1
+            continue
+        previous = newline + 1
+        points.append(previous)
+        target = previous + chunk_size
+    return points
+
+
+def _tokenize_chunk(chunk: str, offset: int, last: bool) -> Optional[tuple[list[_RawToken], int]]:
+    """
+    Tokenize one chunk, returning raw tokens with absolute indexes and the final (relative) line
+    number, or ``None`` if the chunk may have been split inside a token that spans lines.
+    """
+    lexer = AHKLexer()
+    tokens: list[_RawToken] = []
+    append = tokens.append
+    try:
+        for tok in lexer.tokenize(chunk):
+            if not last and tok.type == 'DIVIDE' and chunk.startswith('*', tok.index + 1):
+                # an unterminated block comment here may be terminated in a later chunk
+                return None
+            append((tok.type, tok.value, tok.lineno, tok.index + offset))
+    except AHKTokenizeError:
+        # either a real error or a string literal cut off by the split; the caller re-lexes
+        return None
+    return tokens, lexer.lineno
+
+
+def _make_token(raw: _RawToken, lineno_offset: int, doc: str) -> AHKToken:
+    tok = AHKToken.__new__(AHKToken)
+    tok.type, tok.value, lineno, tok.index = raw
+    tok.lineno = lineno + lineno_offset
+    tok.doc = doc
+    return tok
+
+
+def tokenize_parallel(
+    text: str,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 1 << 20,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> Generator[AHKToken, None, None]:
+    """
+    Tokenize ``text`` in chunks of roughly ``chunk_size`` characters using a process pool.
+
+    The tokens (and any :class:`~ahk_ast.errors.AHKTokenizeError`) are identical to those of
+    :func:`~ahk_ast.tokenizer.tokenize`. A chunk whose start could not be confirmed as a token
+    boundary, for example because a string or block comment spans the split, is re-lexed
+    sequentially from the last confirmed boundary until the lexer reaches the start of a later chunk.
+
+    :param executor: an existing executor to use instead of creating a process pool
+    """
+    points = _find_split_points(text, chunk_size)
+    if not points:
+        yield from tokenize(text)
+        return
+
+    bounds = [0, *points, len(text)]
+    count = len(bounds) - 1
+    pool = executor or concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [
+            pool.submit(_tokenize_chunk, text[bounds[i] : bounds[i + 1]], bounds[i], i == count - 1)
+            for i in range(count)
+        ]
+        starts = {start: i for i, start in enumerate(bounds[:-1])}
+        lineno = 1
+        i = 0
+        while i < count:
+            result = futures[i].result()
+            if result is not None:
+                raw_tokens, last_lineno = result
+                offset = lineno - 1
+                for raw in raw_tokens:
+                    yield _make_token(raw, offset, text)
+                lineno += last_lineno - 1
+                i += 1
+                continue
+
+            # Re-lex from this chunk's start, which is a confirmed token boundary, until a token
+            # ends exactly where a later chunk starts.
+            lexer = AHKLexer()
+            current = i
+            i = count
+            for tok in lexer.tokenize(text, lineno=lineno, index=bounds[current]):
+                yield tok
+                following = starts.get(tok.index + len(tok.value))
+                if following is not None and following > current:
+                    # only a NEWLINE token can end there, so lexer.lineno is up to date
+                    i = following
+                    lineno = lexer.lineno
+                    break
+    finally:
+        if executor is None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -1,7 +1,10 @@
 import sys
+import threading
+import time
 from typing import Any
 from typing import Generator
 from typing import NoReturn
+from typing import Optional
 from typing import Sequence
 from typing import Union
 
@@ -9,6 +12,8 @@ from sly import Parser  # type: ignore[import]
 from sly.lex import Token  # type: ignore[import]
 from sly.yacc import YaccProduction  # type: ignore[import]
 
+from .budget import Budget
+from .budget import CLOCK_INTERVAL
 from .errors import AHKAstBaseException
 from .errors import AHKDecodeError
 from .errors import AHKParsingException
@@ -18,6 +23,56 @@ from .tokenizer import AHKLexer
 from .tokenizer import AHKToken
 from .tokenizer import tokenize
 
+# token types that open and close a nesting level, for Budget.max_depth
+_OPENING = frozenset(('LPAREN', 'LBRACKET', 'LBRACE'))
+_CLOSING = frozenset(('RPAREN', 'RBRACKET', 'RBRACE'))
+_MATCHING = {'LPAREN': 'RPAREN', 'LBRACKET': 'RBRACKET', 'LBRACE': 'RBRACE'}
+
+
+def join_continuation_lines(tokens: Iterable[AHKToken]) -> Generator[AHKToken, None, None]:
+    """
+    Drop the line breaks that AHK treats as continuing the current line: those inside
+    parentheses or brackets, and those before a line that starts with a comma. Runs of whitespace
+    left next to each other are reduced to the first one, as the grammar expects single
+    ``WHITESPACE`` tokens.
+
+    Line breaks inside braces are kept, even when the braces are inside parentheses.
+    """
+    # kinds of the open brackets, innermost last
+    openers: list[str] = []
+    previous = None
+    # a line break outside brackets and the whitespace after it, until we know whether the
+    # next line starts with a comma
+    pending: list[AHKToken] = []
+    for tok in tokens:
+        kind = tok.type
+        if pending:
+            if kind == 'WHITESPACE':
+                pending.append(tok)
+                continue
+            if kind == 'COMMA':
+                whitespace = pending[1:2]
+                if whitespace and previous != 'WHITESPACE':
+                    yield whitespace[0]
+            else:
+                yield from pending
+                previous = pending[-1].type
+            pending = []
+        if kind == 'NEWLINE':
+            if openers and openers[-1] != 'LBRACE':
+                continue
+            pending.append(tok)
+            continue
+        if kind == 'WHITESPACE' and previous == 'WHITESPACE':
+            continue
+        if kind in _OPENING:
+            openers.append(kind)
+        elif kind in _CLOSING and openers and _MATCHING[openers[-1]] == kind:
+            openers.pop()
+        previous = kind
+        yield tok
+    yield from pending
+
 
 class AHKParser(Parser):
     debugfile = 'parser.out'
@@ -27,12 +82,19 @@ class AHKParser(Parser):
     def __init__(self, *args: Any, **kwargs: Any):
         super().__init__(*args, **kwargs)
         self.errors: list[AHKAstBaseException]
-        self.errors = []
         self.last_token: Union[AHKToken, None]
-        self.last_token = None
         self.seen_tokens: list[AHKToken]
-        self.seen_tokens = []
         self.expecting: list[list[str]]
+        self.in_use = False
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clear state left over from a previous parse so the instance can be reused.
+        """
+        self.errors = []
+        self.last_token = None
+        self.seen_tokens = []
         self.expecting = []
 
     @_('WHITESPACE', 'NEWLINE')
@@ -41,7 +103,7 @@ class AHKParser(Parser):
 
     @_('{ wsc } statements { wsc }')
     def program(self, p: YaccProduction) -> Any:
-        return Program(*p.statements)
+        return Program._from_parser(statements=tuple(p.statements))
 
     @_('NEWLINE [ WHITESPACE ] [ statements ]')
     def additional_statement(self, p: YaccProduction) -> Any:
@@ -61,7 +123,7 @@ class AHKParser(Parser):
 
     @_('NAME')
     def location(self, p: YaccProduction) -> Any:
-        return Identifier(name=p[0])
+        return Identifier._from_parser(name=p[0])
 
     @_('')
     def seen_ASSIGN(self, p: YaccProduction) -> Any:
@@ -69,7 +131,7 @@ class AHKParser(Parser):
 
     @_('location [ WHITESPACE ] ASSIGN seen_ASSIGN [ WHITESPACE ] expression')
     def assignment_statement(self, p: YaccProduction) -> Assignment:
-        return Assignment(location=p.location, value=p.expression)
+        return Assignment._from_parser(location=p.location, value=p.expression)
 
     @_('literal', 'location')
     def expression(self, p: YaccProduction) -> Any:
@@ -78,17 +140,15 @@ class AHKParser(Parser):
 
     @_('INTEGER')
     def literal(self, p: YaccProduction) -> Integer:
-        return Integer(value=int(p[0]))
+        return Integer._from_parser(value=int(p[0]))
 
     @_('DOUBLE_QUOTED_STRING')
     def string(self, p: YaccProduction) -> DoubleQuotedString:
-        # TODO: unescape value
-        return DoubleQuotedString(value=p[0][1:-1])
+        return DoubleQuotedString._from_parser(value=p[0][1:-1])
 
     @_('SINGLE_QUOTED_STRING')
     def string(self, p: YaccProduction) -> SingleQuotedString:
-        # TODO: unescape value
-        return SingleQuotedString(value=p[0][1:-1])
+        return SingleQuotedString._from_parser(value=p[0][1:-1])
 
     @_('string')
     def literal(self, p: YaccProduction) -> Any:
@@ -119,11 +179,11 @@ class AHKParser(Parser):
 
     @_('location [ WHITESPACE ] [ seen_function_call_arguments_start function_call_arguments ]')
     def function_call_statement(self, p: YaccProduction) -> FunctionCallStatement:
-        return FunctionCallStatement(
+        return FunctionCallStatement._from_parser(
             func_location=p.location,
-            arguments=[arg for arg in p.function_call_arguments if arg]
+            arguments=tuple(arg for arg in p.function_call_arguments if arg)
             if p.function_call_arguments
-            else None,
+            else (),
         )
 
     @_('')
@@ -138,13 +198,30 @@ class AHKParser(Parser):
         'location LPAREN function_call_seen [ WHITESPACE ] [ seen_function_call_arguments_start function_call_arguments ] seen_RPAREN RPAREN'
     )
     def function_call(self, p: YaccProduction) -> FunctionCall:
-        return FunctionCall(
+        return FunctionCall._from_parser(
             func_location=p.location,
-            arguments=[arg for arg in p.function_call_arguments if arg]
+            arguments=tuple(arg for arg in p.function_call_arguments if arg)
             if p.function_call_arguments
-            else None,
+            else (),
         )
 
+    def _unclosed_bracket(self, end: int) -> Optional[AHKToken]:
+        """
+        The outermost parenthesis or bracket that is still open and has a line break between it
+        and index ``end``. Its line breaks were joined into one line, so it is the likely cause of
+        an error there.
+        """
+        openers: list[AHKToken] = []
+        for tok in self.seen_tokens:
+            if tok.type in _OPENING:
+                openers.append(tok)
+            elif tok.type in _CLOSING and openers and _MATCHING[openers[-1].type] == tok.type:
+                openers.pop()
+        for opener in openers:
+            if opener.type != 'LBRACE' and opener.doc.find('\n', opener.index, end) != -1:
+                return opener
+        return None
+
     def error(self, token: Union[AHKToken, None]) -> NoReturn:
         if token:
             if self.expecting:
@@ -153,9 +230,16 @@ class AHKParser(Parser):
                 message = f"Syntax Error. Was expecting {' or '.join(expected)}"
             else:
                 message = 'Syntax Error'
+            opener = self._unclosed_bracket(token.index)
+            if opener is not None:
+                lineno = opener.doc.count('\n', 0, opener.index) + 1
+                message += f' (the {opener.value!r} on line {lineno} is not closed)'
             raise AHKParsingException(message, token)
 
         elif self.last_token:
+            opener = self._unclosed_bracket(len(self.last_token.doc))
+            if opener is not None:
+                raise AHKParsingException(f'Missing closing bracket for {opener.value!r}', opener)
             doc = self.last_token.doc
             pos = len(doc)
             lineno = doc.count('\n', 0, pos) + 1
@@ -171,34 +255,86 @@ class AHKParser(Parser):
                 'Expecting at least one statement. Received unexpected EOF', None
             )
 
-    def _token_gen(self, tokens: Iterable[AHKToken]) -> Generator[AHKToken, None, None]:
+    def _token_gen(
+        self, tokens: Iterable[AHKToken], budget: Optional[Budget] = None
+    ) -> Generator[AHKToken, None, None]:
+        if budget is None:
+            for tok in tokens:
+                self.last_token = tok
+                self.seen_tokens.append(tok)
+                yield tok
+            return
+        max_tokens = sys.maxsize if budget.max_tokens is None else budget.max_tokens
+        max_depth = sys.maxsize if budget.max_depth is None else budget.max_depth
+        deadline = budget.deadline
+        depth = 0
+        count = 0
         for tok in tokens:
-            # if self.last_token is None and tok.type != "NEWLINE":
-            #     class t(Token):
-            #         type = "NEWLINE"
-            #         index = 0
-            #         lineno = 0
-            #         value = '\n'
-            #     yield AHKToken(tok=t(), doc=tok.doc)
+            if count >= max_tokens:
+                raise budget.exceeded('max_tokens', count, tok)
+            count += 1
+            if not count % CLOCK_INTERVAL and time.perf_counter() > deadline:
+                raise budget.exceeded('timeout', count, tok)
+            if tok.type in _OPENING:
+                depth += 1
+                if depth > max_depth:
+                    raise budget.exceeded('max_depth', count, tok)
+            elif tok.type in _CLOSING:
+                depth = max(depth - 1, 0)
             self.last_token = tok
             self.seen_tokens.append(tok)
             yield tok
 
-    def parse(self, tokens: Iterable[AHKToken]) -> Program:
-        tokens = self._token_gen(tokens)
+    def parse(self, tokens: Iterable[AHKToken], budget: Optional[Budget] = None) -> Program:
+        self.reset()
+        if budget is not None:
+            budget = budget.start()
+        tokens = self._token_gen(join_continuation_lines(tokens), budget)
         model: Program
-        model = super().parse(tokens)
+        self.in_use = True
+        try:
+            model = super().parse(tokens)
+        finally:
+            # don't keep the tokens (and through them, the source text) alive until the next parse
+            self.reset()
+            self.in_use = False
         return model
 
 
-def parse_tokens(raw_tokens: Iterable['Token']) -> Node:
-    parser = AHKParser()
-    return parser.parse(raw_tokens)
+_local = threading.local()
+
+
+def get_parser() -> AHKParser:
+    """
+    Return a reusable parser instance for the current thread.
+
+    A new instance is returned if the thread's parser is in the middle of a parse (for example,
+    when parsing from within a token generator).
+    """
+    parser: Union[AHKParser, None] = getattr(_local, 'parser', None)
+    if parser is None:
+        parser = _local.parser = AHKParser()
+    elif parser.in_use:
+        return AHKParser()
+    return parser
+
+
+def parse_tokens(raw_tokens: Iterable['Token'], budget: Optional[Budget] = None) -> Node:
+    parser = get_parser()
+    return parser.parse(raw_tokens, budget=budget)
+
 
+def parse(text: str, budget: Optional[Budget] = None) -> Node:
+    """
+    Parse AHK source into a :class:`~ahk_ast.model.Program`.
 
-def parse(text: str) -> Node:
-    tokens = tokenize(text)
-    model = parse_tokens(tokens)
+    :param budget: limits on the work done for this input; exceeding one raises
+        :class:`~ahk_ast.errors.AHKBudgetExceededError`
+    """
+    if budget is not None:
+        budget = budget.start()
+    tokens = tokenize(text, budget=budget)
+    model = parse_tokens(tokens, budget=budget)
     return model
 
 
@@ -0,0 +1,331 @@
+"""
+Declarative patterns over AST nodes.
+
+Patterns use Python expression syntax:
+
+- ``Assignment(value=FunctionCall(func_location=Identifier(name='Run')))`` matches an instance of
+  a :mod:`ahk_ast.model` class (or subclass) whose fields match the nested patterns. Fields that
+  are not mentioned are not checked.
+- ``_`` matches anything.
+- ``'Run'``, ``1``, ``None`` match equal values.
+- ``nocase('run')`` matches strings case-insensitively; ``re('^Run')`` matches a regex search.
+- ``a | b`` matches if either ``a`` or ``b`` matches.
+- ``[a, b]`` matches a sequence of exactly two items matching ``a`` and ``b``; ``[a, ...]``
+  matches a sequence of at least one item, the first matching ``a``.
+- ``len > 3`` (or ``>=``, ``<``, ``<=``, ``==``, ``!=``) matches a sequence by its length.
+
+For example, ``FunctionCallStatement(arguments=len > 3)`` finds function call statements with
+more than three arguments.
+
+Patterns are compiled once into matcher functions. A :class:`PatternSet` indexes its patterns by
+the node type at their root, so scanning a tree tests each node only against the patterns
+that can match it.
+"""
+import ast
+import concurrent.futures
+import operator
+import re as _re
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+from typing import cast
+
+from . import model
+from .errors import AHKAstBaseException
+from .errors import AHKPatternError
+from .model import Node
+from .model import walk
+from .parser import parse
+
+Matcher = Callable[[Any], bool]
+
+_COMPARISONS = {
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+
+def _anything(value: Any) -> bool:
+    return True
+
+
+def _compile_node_pattern(node_type: type[Node], checks: list[tuple[str, Matcher]]) -> Matcher:
+    def match(value: Any) -> bool:
+        if not isinstance(value, node_type):
+            return False
+        attrs = value.__dict__
+        for name, check in checks:
+            if name not in attrs or not check(attrs[name]):
+                return False
+        return True
+
+    return match
+
+
+def _compile_sequence(items: list[Matcher], open_ended: bool) -> Matcher:
+    count = len(items)
+
+    def match(value: Any) -> bool:
+        if not isinstance(value, (list, tuple)):
+            return False
+        if len(value) < count or (not open_ended and len(value) != count):
+            return False
+        return all(check(item) for check, item in zip(items, value))
+
+    return match
+
+
+def _compile_length(compare: Callable[[int, int], bool], length: int) -> Matcher:
+    def match(value: Any) -> bool:
+        return isinstance(value, (list, tuple)) and compare(len(value), length)
+
+    return match
+
+
+def _compile_alternatives(left: Matcher, right: Matcher) -> Matcher:
+    def match(value: Any) -> bool:
+        return left(value) or right(value)
+
+    return match
+
+
+def _compile_constant(constant: Any) -> Matcher:
+    def match(value: Any) -> bool:
+        return type(value) is type(constant) and value == constant
+
+    return match
+
+
+def _compile_nocase(text: str) -> Matcher:
+    folded = text.casefold()
+
+    def match(value: Any) -> bool:
+        return isinstance(value, str) and value.casefold() == folded
+
+    return match
+
+
+def _compile_regex(pattern: str) -> Matcher:
+    search = _re.compile(pattern).search
+
+    def match(value: Any) -> bool:
+        return isinstance(value, str) and search(value) is not None
+
+    return match
+
+
+class _Compiler:
+    def __init__(self, source: str):
+        self.source = source
+
+    def error(self, message: str, node: ast.AST) -> AHKPatternError:
+        segment = ast.get_source_segment(self.source, node) or self.source
+        return AHKPatternError(f'{message}: {segment!r}')
+
+    def root_types(self, node: ast.expr) -> tuple[type, ...]:
+        """
+        Types a value must be an instance of to possibly match ``node``
+        """
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            node_type = getattr(model, node.func.id, None)
+            if isinstance(node_type, type) and issubclass(node_type, Node):
+                return (node_type,)
+            return ()
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            return self.root_types(node.left) + self.root_types(node.right)
+        if isinstance(node, ast.Name) and node.id == '_':
+            return (Node,)
+        return ()
+
+    def compile(self, node: ast.expr) -> Matcher:
+        if isinstance(node, ast.Name):
+            if node.id == '_':
+                return _anything
+            raise self.error('Unknown name (did you mean a node type call?)', node)
+        if isinstance(node, ast.Constant):
+            if node.value is Ellipsis:
+                raise self.error('... is only allowed at the end of a sequence pattern', node)
+            return _compile_constant(node.value)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            return _compile_alternatives(self.compile(node.left), self.compile(node.right))
+        if isinstance(node, ast.List):
+            items = node.elts
+            open_ended = (
+                bool(items) and isinstance(items[-1], ast.Constant) and items[-1].value is Ellipsis
+            )
+            if open_ended:
+                items = items[:-1]
+            return _compile_sequence([self.compile(item) for item in items], open_ended)
+        if isinstance(node, ast.Compare):
+            if (
+                isinstance(node.left, ast.Name)
+                and node.left.id == 'len'
+                and len(node.ops) == 1
+                and type(node.ops[0]) in _COMPARISONS
+                and isinstance(node.comparators[0], ast.Constant)
+                and type(node.comparators[0].value) is int
+            ):
+                return _compile_length(_COMPARISONS[type(node.ops[0])], node.comparators[0].value)
+            raise self.error('Only comparisons of the form "len > N" are supported', node)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            return self.compile_call(node, node.func.id)
+        raise self.error('Unsupported pattern syntax', node)
+
+    def compile_call(self, node: ast.Call, name: str) -> Matcher:
+        if name in ('nocase', 're'):
+            if (
+                len(node.args) != 1
+                or node.keywords
+                or not isinstance(node.args[0], ast.Constant)
+                or not isinstance(node.args[0].value, str)
+            ):
+                raise self.error(f'{name}() takes a single string argument', node)
+            if name == 'nocase':
+                return _compile_nocase(node.args[0].value)
+            try:
+                return _compile_regex(node.args[0].value)
+            except _re.error as e:
+                raise self.error(f'Invalid regular expression ({e})', node) from e
+
+        node_type = getattr(model, name, None)
+        if not (isinstance(node_type, type) and issubclass(node_type, Node)):
+            raise self.error(f'Unknown node type {name!r}', node)
+        if node.args:
+            raise self.error('Node fields must be given as keywords', node)
+        checks = []
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                raise self.error('**kwargs are not supported', node)
+            checks.append((keyword.arg, self.compile(keyword.value)))
+        return _compile_node_pattern(node_type, checks)
+
+
+class Pattern:
+    """
+    A compiled pattern. See the module documentation for the syntax.
+
+    :param name: optional label reported with matches (defaults to the source)
+    """
+
+    def __init__(self, source: str, name: Optional[str] = None):
+        self.source = source
+        self.name = name if name is not None else source
+        try:
+            expression = cast(ast.Expression, ast.parse(source.strip(), mode='eval')).body
+        except SyntaxError as e:
+            raise AHKPatternError(f'Invalid pattern syntax: {source!r} ({e.msg})') from e
+        compiler = _Compiler(source.strip())
+        self.match: Matcher = compiler.compile(expression)
+        #: a node must be an instance of one of these types to match
+        self.root_types = compiler.root_types(expression)
+
+    def find_all(self, tree: Node) -> list[Node]:
+        """
+        All nodes in ``tree`` that match, in depth-first order
+        """
+        root_types = self.root_types
+        match = self.match
+        return [node for node in walk(tree) if isinstance(node, root_types) and match(node)]
+
+    def __repr__(self) -> str:
+        return f'Pattern({self.source!r})'
+
+
+class Match(NamedTuple):
+    pattern: Pattern
+    node: Node
+
+
+class FileMatches(NamedTuple):
+    path: str
+    matches: list[Match]
+    error: Optional[Exception]
+
+
+class PatternSet:
+    """
+    A collection of patterns matched together in a single traversal.
+
+    :param patterns: pattern sources or :class:`Pattern` objects, or a mapping of names to sources
+    """
+
+    def __init__(self, patterns: Union[Iterable[Union[str, Pattern]], dict[str, str]]):
+        if isinstance(patterns, dict):
+            self.patterns = [Pattern(source, name) for name, source in patterns.items()]
+        else:
+            self.patterns = [p if isinstance(p, Pattern) else Pattern(p) for p in patterns]
+        self._by_type: dict[type, tuple[int, ...]] = {}
+
+    def _candidates(self, node_type: type) -> tuple[int, ...]:
+        candidates = self._by_type.get(node_type)
+        if candidates is None:
+            candidates = self._by_type[node_type] = tuple(
+                i
+                for i, pattern in enumerate(self.patterns)
+                if issubclass(node_type, pattern.root_types)
+            )
+        return candidates
+
+    def _scan_indexes(self, tree: Node) -> list[tuple[int, Node]]:
+        found = []
+        patterns = self.patterns
+        by_type = self._by_type
+        for node in walk(tree):
+            node_type = type(node)
+            candidates = by_type.get(node_type)
+            if candidates is None:
+                candidates = self._candidates(node_type)
+            for i in candidates:
+                if patterns[i].match(node):
+                    found.append((i, node))
+        return found
+
+    def scan(self, tree: Node) -> list[Match]:
+        """
+        All ``(pattern, node)`` matches in ``tree``, in depth-first order
+        """
+        patterns = self.patterns
+        return [Match(patterns[i], node) for i, node in self._scan_indexes(tree)]
+
+    def scan_files(
+        self, paths: Iterable[str], max_workers: Optional[int] = None, chunksize: int = 16
+    ) -> Iterator[FileMatches]:
+        """
+        Parse and scan many files in a process pool, yielding results in the order of ``paths``.
+
+        Each worker compiles the patterns once. Files that cannot be read or parsed are reported
+        with ``error`` set and no matches.
+        """
+        sources = [(pattern.source, pattern.name) for pattern in self.patterns]
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(sources,)
+        ) as pool:
+            for path, found, error in pool.map(_scan_file, paths, chunksize=chunksize):
+                matches = [Match(self.patterns[i], node) for i, node in found]
+                yield FileMatches(path, matches, error)
+
+
+_worker_patterns: Optional[PatternSet] = None
+
+
+def _init_worker(sources: list[tuple[str, str]]) -> None:
+    global _worker_patterns
+    _worker_patterns = PatternSet([Pattern(source, name) for source, name in sources])
+
+
+def _scan_file(path: str) -> tuple[str, list[tuple[int, Node]], Optional[Exception]]:
+    assert _worker_patterns is not None
+    try:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        return path, _worker_patterns._scan_indexes(parse(text)), None
+    except (OSError, UnicodeDecodeError, AHKAstBaseException) as e:
+        return path, [], e
@@ -0,0 +1,264 @@
+"""
+Hand parse results from worker processes to the parent through shared memory.
+
+Returning a :class:`~ahk_ast.model.Program` from a process pool pickles every node in the
+worker and rebuilds every node in the parent. Instead, a worker can store its result in a
+:class:`~ahk_ast.columnar.ColumnarTree` and :func:`share` it: the node arrays are copied once into
+a :class:`multiprocessing.shared_memory.SharedMemory` block, and only the block's name travels
+back. :meth:`SharedTree.attach` maps the block in the parent and uses read-only ``memoryview``
+casts of it as the tree's arrays, so nothing is copied or unpickled per node; the node types,
+field names and interned attribute values are unpickled once per block.
+
+Block layout (native byte order and item sizes; both processes run on the same machine)::
+
+    header    magic b'AHKS', version (uint32), attached flag (uint32), item count of each of
+              the 7 arrays (uint64), metadata length (uint64)
+    arrays    kinds, parents, first_child, next_sibling, fields, values, roots, each starting
+              at a multiple of 8 bytes
+    metadata  pickle of (kind_types, kind_fields, field_names, interned)
+
+Blocks are unlinked by the process that attaches them, when the :class:`SharedTree` is closed.
+The process that created a block keeps it open until it has been attached: on Windows, a named
+mapping is destroyed as soon as its last handle is closed. Attaching sets the header's attached
+flag, and the creating process closes its handles to attached blocks the next time it calls
+:func:`share` (or when it exits).
+"""
+import concurrent.futures
+import pickle
+import struct
+from array import array
+from multiprocessing import resource_tracker  # type: ignore[attr-defined]
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from .columnar import ColumnarTree
+from .columnar import NodeView
+from .errors import AHKAstBaseException
+from .errors import AHKSharedMemoryError
+from .model import Node
+
+MAGIC = b'AHKS'
+VERSION = 2
+
+_COLUMNS = ('kinds', 'parents', 'first_child', 'next_sibling', 'fields', 'values', 'roots')
+_HEADER = struct.Struct(f'=4sII{len(_COLUMNS)}QQ')
+_ATTACHED_OFFSET = 8
+_ALIGNMENT = 8
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+# blocks created by share() in this process that may not have been attached yet
+_created_blocks: dict[str, SharedMemory] = {}
+
+
+def _close_attached_blocks() -> None:
+    for name, block in list(_created_blocks.items()):
+        if block.buf[_ATTACHED_OFFSET]:
+            del _created_blocks[name]
+            block.close()
+
+
+class SharedTreeHandle(NamedTuple):
+    """
+    Picklable reference to a shared tree block
+    """
+
+    name: str
+    size: int
+
+
+class SharedResult(NamedTuple):
+    path: str
+    tree: Optional['SharedTree']
+    error: Optional[Exception]
+
+
+def share(tree: ColumnarTree) -> SharedTreeHandle:
+    """
+    Copy ``tree`` into a new shared memory block and return its handle. The block outlives this
+    call; whoever attaches it is responsible for unlinking it.
+    """
+    _close_attached_blocks()
+    columns: list['array[int]'] = [getattr(tree, name) for name in _COLUMNS]
+    metadata = pickle.dumps(
+        (tree.kind_types, tree.kind_fields, tree.field_names, tree.interned),
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    offsets = []
+    offset = _HEADER.size
+    for column in columns:
+        offset = _aligned(offset)
+        offsets.append(offset)
+        offset += len(column) * column.itemsize
+    size = offset + len(metadata)
+
+    block = SharedMemory(create=True, size=size)
+    try:
+        buffer = block.buf
+        _HEADER.pack_into(
+            buffer, 0, MAGIC, VERSION, 0, *(len(column) for column in columns), len(metadata)
+        )
+        for column, start in zip(columns, offsets):
+            data = memoryview(column).cast('B')
+            buffer[start : start + len(data)] = data
+        buffer[offset:size] = metadata
+        del buffer
+    except BaseException:
+        block.close()
+        block.unlink()
+        raise
+    _created_blocks[block.name] = block
+    return SharedTreeHandle(block.name, size)
+
+
+class SharedTree(ColumnarTree):
+    """
+    A read-only :class:`~ahk_ast.columnar.ColumnarTree` whose arrays are views of a shared
+    memory block. All of the queries and :class:`~ahk_ast.columnar.NodeView` attributes work as
+    usual; :meth:`~ahk_ast.columnar.ColumnarTree.add` raises :class:`TypeError`.
+
+    Use as a context manager, or call :meth:`close`, to unmap (and by default unlink) the block.
+    Views of a closed tree cannot be used; materialize nodes with
+    :meth:`~ahk_ast.columnar.NodeView.to_node` first to keep them.
+    """
+
+    def __init__(self, block: SharedMemory):
+        super().__init__()
+        self._block: Optional[SharedMemory] = block
+        buffer = block.buf.toreadonly()
+        self._views = [buffer]
+        try:
+            self._load(block.name, buffer)
+        except BaseException:
+            # the block cannot be closed while views of it are alive
+            self._release_views()
+            raise
+        # lets the creating process close its handle
+        block.buf[_ATTACHED_OFFSET] = 1
+
+    def _load(self, block_name: str, buffer: memoryview) -> None:
+        try:
+            magic, version, _, *counts, metadata_length = _HEADER.unpack_from(buffer)
+        except struct.error:
+            raise AHKSharedMemoryError(f'{block_name} is not a shared tree block') from None
+        if magic != MAGIC:
+            raise AHKSharedMemoryError(f'{block_name} is not a shared tree block')
+        if version != VERSION:
+            raise AHKSharedMemoryError(f'Unsupported shared tree version {version}')
+        offset = _HEADER.size
+        for name, count in zip(_COLUMNS, counts):
+            typecode = getattr(self, name).typecode
+            itemsize = array(typecode).itemsize
+            offset = _aligned(offset)
+            view = buffer[offset : offset + count * itemsize].cast(typecode)
+            self._views.append(view)
+            setattr(self, name, view)
+            offset += count * itemsize
+        with buffer[offset : offset + metadata_length] as metadata:
+            self.kind_types, self.kind_fields, self.field_names, self.interned = pickle.loads(
+                metadata
+            )
+        self._kind_ids = {kind_type: kind for kind, kind_type in enumerate(self.kind_types)}
+        self._field_ids = {name: field for field, name in enumerate(self.field_names)}
+
+    @classmethod
+    def attach(cls, handle: SharedTreeHandle) -> 'SharedTree':
+        """
+        Map the block behind ``handle``, which was returned by :func:`share`
+        """
+        try:
+            block = SharedMemory(name=handle.name)
+        except FileNotFoundError:
+            raise AHKSharedMemoryError(f'Shared tree block {handle.name} does not exist') from None
+        try:
+            return cls(block)
+        except BaseException:
+            block.close()
+            raise
+
+    def _release_views(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+
+    def add(self, root: Node) -> NodeView:
+        raise TypeError('SharedTree is read-only')
+
+    def close(self, unlink: bool = True) -> None:
+        """
+        Release the views and unmap the block; with ``unlink``, also free it
+        """
+        block = self._block
+        if block is None:
+            return
+        self._block = None
+        self._release_views()
+        block.close()
+        if unlink:
+            block.unlink()
+
+    def __enter__(self) -> 'SharedTree':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def parse_shared(text: str) -> SharedTreeHandle:
+    """
+    Parse ``text`` into a new shared tree block. Meant to run in a worker process.
+    """
+    tree = ColumnarTree()
+    tree.parse(text)
+    return share(tree)
+
+
+def parse_file_shared(path: str) -> tuple[Optional[SharedTreeHandle], Optional[Exception]]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        return parse_shared(text), None
+    except (OSError, UnicodeDecodeError, AHKAstBaseException) as e:
+        return None, e
+
+
+def parse_files(
+    paths: Sequence[str],
+    max_workers: Optional[int] = None,
+    mp_context: Optional[BaseContext] = None,
+) -> Iterator[SharedResult]:
+    """
+    Parse ``paths`` in a process pool and yield a :class:`SharedResult` for each as it completes.
+    The caller owns each result's ``tree`` and should close it when done with it.
+
+    :param mp_context: multiprocessing context for the pool, e.g. ``get_context('spawn')``
+    """
+    # workers must report their blocks to the same resource tracker as this process, or the
+    # tracker of a worker that exits could unlink blocks this process has not attached yet
+    resource_tracker.ensure_running()
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=mp_context
+    ) as pool:
+        futures = {pool.submit(parse_file_shared, path): path for path in paths}
+        pending = set(futures)
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                pending.discard(future)
+                handle, error = future.result()
+                tree = None if handle is None else SharedTree.attach(handle)
+                yield SharedResult(futures[future], tree, error)
+        finally:
+            # free the blocks of results that were never yielded
+            for future in pending:
+                if not future.cancel() and future.exception() is None:
+                    handle, _ = future.result()
+                    if handle is not None:
+                        SharedTree.attach(handle).close()
@@ -0,0 +1,208 @@
+"""
+Scaling stress tests for the tokenizer and parser.
+
+Each *construct* builds an input of a given size: realistic programs from a small grammar-aware
+generator, and adversarial inputs aimed at the lexer's riskier rules (block comments, quoted
+strings, keyword lookaheads). :func:`run` times tokenizing and parsing every construct at
+1x, 10x and 100x its base size, fits the slope of log(time) against log(size) and flags any
+construct whose time grows faster than linearly. Inputs are generated from a seed, so a flagged
+result can be reproduced, and the largest input of each flagged construct can be saved.
+
+    python -m ahk_ast.stress [--base 200] [--seed 0] [--threshold 1.3] [--save DIR]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from .errors import AHKAstBaseException
+from .parser import parse
+from .tokenizer import tokenize
+
+_KEYWORDS = ('if', 'else', 'loop', 'return', 'while', 'for', 'class', 'global')
+
+_FUNCTIONS = ('MsgBox', 'Send', 'Run', 'WinActivate', 'Sleep', 'ToolTip')
+
+
+def _identifier(rng: random.Random) -> str:
+    name = rng.choice(('a', 'b', 'title', 'delay', 'x_1', 'count'))
+    # identifiers that start with a keyword exercise the keyword lookaheads
+    if rng.random() < 0.2:
+        name = rng.choice(_KEYWORDS) + name
+    return name
+
+
+def _literal(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.3:
+        return str(rng.randrange(1000))
+    if kind < 0.6:
+        return '"' + rng.choice(('hello', 'a `"quoted`" word', 'tab`there', '')) + '"'
+    if kind < 0.8:
+        return "'" + rng.choice(('single', "it`'s", '')) + "'"
+    return _identifier(rng)
+
+
+def generate_statement(rng: random.Random) -> str:
+    """
+    One random statement in the subset of AHK the parser accepts
+    """
+    kind = rng.random()
+    if kind < 0.4:
+        return f'{_identifier(rng)} := {_literal(rng)}'
+    arguments = [_literal(rng) for _ in range(rng.randrange(4))]
+    if kind < 0.7:
+        return f'{rng.choice(_FUNCTIONS)}({", ".join(arguments)})'
+    if not arguments:
+        return rng.choice(_FUNCTIONS)
+    return f'{rng.choice(_FUNCTIONS)} {", ".join(arguments)}'
+
+
+def generate_program(rng: random.Random, statements: int) -> str:
+    return '\n'.join(generate_statement(rng) for _ in range(statements)) + '\n'
+
+
+# construct name -> function building an input of ``size`` units
+CONSTRUCTS: dict[str, Callable[[random.Random, int], str]] = {
+    'program': generate_program,
+    'long_block_comment': lambda rng, n: '/*' + ' comment *\n' * n + '*/\na := 1\n',
+    'many_block_comments': lambda rng, n: '/* c */\n' * n + 'a := 1\n',
+    'unterminated_block_comments': lambda rng, n: '/* x ' * n + '\n',
+    'long_string': lambda rng, n: 'a := "' + 'text `" ' * n + '"\n',
+    'many_strings': lambda rng, n: 'MsgBox ' + ', '.join(['"s"'] * n) + '\n',
+    'string_of_backticks': lambda rng, n: 'a := "' + '``' * n + '"\n',
+    'long_identifier': lambda rng, n: 'if' + 'x' * (10 * n) + ' := 1\n',
+    'keyword_like_identifiers': lambda rng, n: ''.join(
+        f'{rng.choice(_KEYWORDS)}{i} := 1\n' for i in range(n)
+    ),
+    'long_whitespace': lambda rng, n: 'a :=' + ' ' * (10 * n) + '1\n',
+    'inline_comments': lambda rng, n: 'a := 1 ; comment\n' * n,
+}
+
+
+class StressResult(NamedTuple):
+    construct: str
+    phase: str
+    sizes: tuple[int, ...]
+    seconds: tuple[float, ...]
+    slope: float
+    flagged: bool
+
+
+def fit_slope(sizes: Sequence[float], seconds: Sequence[float]) -> float:
+    """
+    Least-squares slope of log(seconds) against log(sizes): about 1 for linear growth, 2 for
+    quadratic
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(second, 1e-9)) for second in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return numerator / denominator
+
+
+def _tokenize(text: str) -> None:
+    try:
+        for _ in tokenize(text):
+            pass
+    except AHKAstBaseException:
+        pass
+
+
+def _parse(text: str) -> None:
+    try:
+        parse(text)
+    except AHKAstBaseException:
+        pass
+
+
+_PHASES = {'tokenize': _tokenize, 'parse': _parse}
+
+
+def _time(func: Callable[[str], None], text: str, repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(
+    constructs: Optional[Sequence[str]] = None,
+    base: int = 200,
+    scales: Sequence[int] = (1, 10, 100),
+    seed: int = 0,
+    threshold: float = 1.3,
+    min_seconds: float = 0.005,
+    repeat: int = 3,
+    save: Optional[str] = None,
+) -> list[StressResult]:
+    """
+    Time each construct at ``base * scale`` units for every scale.
+
+    :param threshold: flag slopes above this
+    :param min_seconds: don't flag a construct whose largest input takes less than this, where
+        timer noise dominates the fit
+    :param save: directory to write the largest input of each flagged construct to, as
+        ``<construct>-<size>.ahk``
+    """
+    results = []
+    for name in constructs or CONSTRUCTS:
+        build = CONSTRUCTS[name]
+        sizes = tuple(base * scale for scale in scales)
+        texts = [build(random.Random(seed), size) for size in sizes]
+        for phase, func in _PHASES.items():
+            seconds = tuple(_time(func, text, repeat) for text in texts)
+            slope = fit_slope(sizes, seconds)
+            flagged = slope > threshold and seconds[-1] >= min_seconds
+            results.append(StressResult(name, phase, sizes, seconds, slope, flagged))
+            if flagged and save is not None:
+                os.makedirs(save, exist_ok=True)
+                path = os.path.join(save, f'{name}-{sizes[-1]}.ahk')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(texts[-1])
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m ahk_ast.stress',
+        description='Check that tokenizing and parsing time grows linearly with input size.',
+    )
+    arg_parser.add_argument('constructs', nargs='*', help=f'any of {", ".join(CONSTRUCTS)}')
+    arg_parser.add_argument('--base', type=int, default=200, help='units at 1x')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--threshold', type=float, default=1.3)
+    arg_parser.add_argument('--save', help='directory for the inputs of flagged constructs')
+    args = arg_parser.parse_args(argv)
+    unknown = [name for name in args.constructs if name not in CONSTRUCTS]
+    if unknown:
+        arg_parser.error(f'unknown construct(s): {", ".join(unknown)}')
+
+    results = run(
+        args.constructs or None,
+        base=args.base,
+        seed=args.seed,
+        threshold=args.threshold,
+        save=args.save,
+    )
+    for result in results:
+        timings = '  '.join(f'{second * 1000:9.2f}ms' for second in result.seconds)
+        flag = '  SUPER-LINEAR' if result.flagged else ''
+        print(
+            f'{result.construct:<28} {result.phase:<9} {timings}  slope {result.slope:5.2f}{flag}'
+        )
+    return 1 if any(result.flagged for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
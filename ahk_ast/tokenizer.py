@@ -1,10 +1,12 @@
 import logging
 import os
 import sys
+import time
 from typing import Any
 from typing import Generator
 from typing import Iterable
 from typing import NoReturn
+from typing import Optional
 from typing import Sequence
 from typing import Union
 
@@ -12,6 +14,9 @@ import regex as re  # type: ignore[import]
 from sly import Lexer  # type: ignore[import]
 from sly.lex import Token  # type: ignore[import]
 
+from .budget import Budget
+from .budget import CLOCK_INTERVAL
+
 logger = logging.getLogger(__name__)
 # logger.addHandler(logging.StreamHandler(stream=sys.stderr))
 # logger.setLevel(level=logging.DEBUG)
@@ -33,9 +38,49 @@ class AHKToken(Token):
         return f'AHKToken(type={self.type!r}, value={self.value!r}, lineno={self.lineno}, index={self.index})'
 
 
+def _scan_quoted_string(text: str, pos: int, quote: str) -> int:
+    """
+    Find the end of the string literal whose opening ``quote`` is at ``pos``.
+
+    Equivalent to matching ``"(?:[^"`]|`.)*"`` at ``pos``, but jumps between quotes and backticks
+    with ``str.find`` instead of stepping the regex engine once per character.
+    Returns the index just past the closing quote, or -1 if the literal is unterminated.
+    """
+    find = text.find
+    pos += 1
+    end = find(quote, pos)
+    while end != -1:
+        escape = find('`', pos, end)
+        if escape == -1:
+            return end + 1
+        if text[escape + 1] == '\n':
+            # like ``.`` in the pattern, a backtick cannot escape a newline
+            return -1
+        pos = escape + 2
+        if pos > end:
+            # the escaped character was the quote we found; look for the next one
+            end = find(quote, pos)
+    return -1
+
+
+def _scan_block_comment(text: str, pos: int) -> int:
+    """
+    Find the end of the block comment that opens at ``pos``.
+
+    Equivalent to matching ``/\\*((.|\\n))*?\\*/`` at ``pos``.
+    Returns the index just past the closing ``*/``, or -1 if the comment is unterminated.
+    """
+    end = text.find('*/', pos + 2)
+    if end == -1:
+        return -1
+    return end + 2
+
+
 class AHKLexer(Lexer):
     def __init__(self, *args: Any, **kwargs: Any):
         self._include_comments = kwargs.pop('include_whitespace', True)
+        # offset from which the text is known to contain no ``*/``; reset by tokenize()
+        self._comment_end_missing_from = sys.maxsize
         super().__init__(*args, **kwargs)
 
     regex_module = re
@@ -145,8 +190,24 @@ class AHKLexer(Lexer):
     # def ignore_newline(self, tok):
     #     self.lineno += tok.value.count('\n')
 
-    @_(r'/\*((.|\n))*?\*/')  # type: ignore
+    @_(r'/\*')  # type: ignore
     def BLOCK_COMMENT(self, tok: Token) -> Union[Token, None]:
+        if tok.index < self._comment_end_missing_from:
+            end = _scan_block_comment(self.text, tok.index)
+            if end == -1:
+                # There is no ``*/`` after this point, so every later ``/*`` is unterminated
+                # too. Remembering that keeps a run of ``/*`` without a ``*/`` linear.
+                self._comment_end_missing_from = tok.index
+        else:
+            end = -1
+        if end == -1:
+            # Unterminated comment. The opening ``/`` is lexed on its own as division.
+            tok.type = 'DIVIDE'
+            tok.value = '/'
+            self.index = tok.index + 1
+            return tok
+        tok.value = self.text[tok.index : end]
+        self.index = end
         self.lineno += tok.value.count('\n')
         if self._include_comments:
             return tok
@@ -174,8 +235,25 @@ class AHKLexer(Lexer):
     #     # r'\\\d{1,3}',
     #     # r'\\x[a-fA-F0-9]{1,2}',
     # ]
-    DOUBLE_QUOTED_STRING = r'"(?:[^"`]|`.)*"'
-    SINGLE_QUOTED_STRING = r"'(?:[^'`]|`.)*'"
+    @_(r'"')  # type: ignore[name-defined]
+    def DOUBLE_QUOTED_STRING(self, tok: Token) -> Token:
+        return self._quoted_string(tok, '"')
+
+    @_(r"'")  # type: ignore[name-defined]
+    def SINGLE_QUOTED_STRING(self, tok: Token) -> Token:
+        return self._quoted_string(tok, "'")
+
+    def _quoted_string(self, tok: Token, quote: str) -> Token:
+        end = _scan_quoted_string(self.text, tok.index, quote)
+        if end == -1:
+            # No other rule starts with a quote, so this is an illegal character
+            self.index = tok.index
+            tok.type = 'ERROR'
+            tok.value = self.text[tok.index :]
+            return self.error(tok)
+        tok.value = self.text[tok.index : end]
+        self.index = end
+        return tok
 
     # Specify tokens as regex rules
     DOLLAR = r'\$'
@@ -283,22 +361,73 @@ class AHKLexer(Lexer):
     DCOLON = r'::'
     COLON = r':'
 
-    def tokenize(self, text: str, *args: Any, **kwargs: Any) -> Generator[AHKToken, None, None]:
-        for tok in super().tokenize(text, *args, **kwargs):
-            tok = AHKToken(tok, text)
-            yield tok
+    def tokenize(
+        self, text: str, *args: Any, budget: Optional[Budget] = None, **kwargs: Any
+    ) -> Generator[AHKToken, None, None]:
+        self._comment_end_missing_from = len(text)
+        tokens = super().tokenize(text, *args, **kwargs)
+        if budget is None:
+            for tok in tokens:
+                yield AHKToken(tok, text)
+            return
+        budget = budget.start()
+        budget.check_input(text)
+        max_tokens = sys.maxsize if budget.max_tokens is None else budget.max_tokens
+        deadline = budget.deadline
+        count = 0
+        for tok in tokens:
+            if count >= max_tokens:
+                raise budget.exceeded('max_tokens', count, tok)
+            count += 1
+            if not count % CLOCK_INTERVAL and time.perf_counter() > deadline:
+                raise budget.exceeded('timeout', count, tok)
+            yield AHKToken(tok, text)
 
     def error(self, t: AHKToken) -> NoReturn:
         from .errors import AHKTokenizeError
 
         raise AHKTokenizeError(
-            f'Illegal character {t.value[0]!r} at index {self.index} (line {self.lineno})', None
+            f'Illegal character {t.value[0]!r} at index {self.index} (line {self.lineno})',
+            AHKToken(t, self.text),
         )
 
 
-def tokenize(text: str) -> Generator[Token, None, None]:
+_KEYWORD_RULE = re.compile(r'\(\?i\)([a-z]+)( [a-z]+)?\(\?!\[a-zA-Z_\\d\]\+\)')
+
+
+_CompoundKeywords = dict[str, list[tuple[str, str]]]
+
+
+def _split_keyword_rules() -> tuple[list[tuple[str, str]], dict[str, str], _CompoundKeywords]:
+    """
+    Separate the keyword rules from the lexer's other rules, for scanners that look keywords up
+    after matching a NAME instead of trying ~40 alternatives at every identifier. This gives the
+    same result: every keyword rule precedes NAME and matches exactly when the whole identifier
+    is the keyword (case-insensitively), or, for ``loop count`` and friends, when ``loop`` is
+    followed by a space and the second word.
+
+    Returns the remaining ``(name, pattern)`` rules in order, the single-word keywords by
+    lowercase word, and the two-word keywords (second word with its leading space, and token
+    type) by their first word.
+    """
+    rules = []
+    keywords: dict[str, str] = {}
+    compound_keywords: _CompoundKeywords = {}
+    for name, rule in AHKLexer._rules:
+        pattern = rule if isinstance(rule, str) else rule.pattern
+        keyword = _KEYWORD_RULE.fullmatch(pattern)
+        if keyword is None:
+            rules.append((name, pattern))
+        elif keyword.group(2):
+            compound_keywords.setdefault(keyword.group(1), []).append((keyword.group(2), name))
+        else:
+            keywords[keyword.group(1)] = name
+    return rules, keywords, compound_keywords
+
+
+def tokenize(text: str, budget: Optional[Budget] = None) -> Generator[Token, None, None]:
     lexer = AHKLexer()
-    tokens = lexer.tokenize(text)
+    tokens = lexer.tokenize(text, budget=budget)
     return tokens
 
 
@@ -0,0 +1,152 @@
+"""
+Watch a directory and keep every AHK file in it tokenized and parsed.
+
+The watcher polls file modification times, so it needs no platform-specific notification API. On
+each poll only files that were added or whose size or mtime changed are read and parsed again;
+tokens, trees and diagnostics for the others stay in memory, and the parser's tables are built
+once for the lifetime of the process.
+
+    python -m ahk_ast.watch [directory] [--pattern '*.ahk'] [--interval 0.5] [--once]
+"""
+import argparse
+import fnmatch
+import os
+import sys
+import time
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import TextIO
+
+from .errors import AHKAstBaseException
+from .model import Program
+from .parser import get_parser
+from .tokenizer import AHKToken
+from .tokenizer import tokenize
+
+
+class FileState(NamedTuple):
+    mtime_ns: int
+    size: int
+    tokens: Optional[list[AHKToken]]
+    program: Optional[Program]
+    error: Optional[Exception]
+
+
+def diagnostic(path: str, error: Optional[Exception]) -> str:
+    """
+    ``path: ok``, or ``path:line:column: message`` for a file that failed to parse
+    """
+    if error is None:
+        return f'{path}: ok'
+    lineno = getattr(error, 'lineno', 0)
+    colno = getattr(error, 'colno', 0)
+    return f'{path}:{lineno}:{colno}: {error}'
+
+
+class Watcher:
+    """
+    Parsed state for the files under ``root`` matching ``pattern``, updated by :meth:`poll`
+    """
+
+    def __init__(self, root: str, pattern: str = '*.ahk'):
+        self.root = root
+        self.pattern = pattern
+        self.files: dict[str, FileState] = {}
+
+    def _scan(self) -> dict[str, os.stat_result]:
+        found = {}
+        pending = [self.root]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                # deleted since it was listed (e.g. during a branch switch), or unreadable
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif fnmatch.fnmatch(entry.name, self.pattern):
+                        try:
+                            found[entry.path] = entry.stat()
+                        except OSError:
+                            # deleted since it was listed
+                            continue
+        return found
+
+    def _load(self, path: str, stat: os.stat_result) -> FileState:
+        tokens = None
+        try:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            tokens = list(tokenize(text))
+            program = get_parser().parse(tokens)
+        except (OSError, UnicodeDecodeError, AHKAstBaseException) as e:
+            return FileState(stat.st_mtime_ns, stat.st_size, tokens, None, e)
+        return FileState(stat.st_mtime_ns, stat.st_size, tokens, program, None)
+
+    def poll(self) -> tuple[list[str], list[str]]:
+        """
+        Reparse the files that were added or modified since the last poll.
+
+        :return: the paths that were (re)parsed and the paths that were removed
+        """
+        current = self._scan()
+        removed = [path for path in self.files if path not in current]
+        for path in removed:
+            del self.files[path]
+        changed = []
+        for path, stat in sorted(current.items()):
+            state = self.files.get(path)
+            if state is None or (state.mtime_ns, state.size) != (stat.st_mtime_ns, stat.st_size):
+                self.files[path] = self._load(path, stat)
+                changed.append(path)
+        return changed, removed
+
+    def report(self, out: Optional[TextIO] = None) -> int:
+        """
+        Poll and print diagnostics for the files that changed. Returns the number of files that
+        currently have errors.
+
+        :param out: defaults to ``sys.stdout``
+        """
+        if out is None:
+            out = sys.stdout
+        changed, removed = self.poll()
+        for path in removed:
+            print(f'{path}: removed', file=out)
+        for path in changed:
+            print(diagnostic(path, self.files[path].error), file=out)
+        if changed or removed:
+            out.flush()
+        return sum(state.error is not None for state in self.files.values())
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m ahk_ast.watch',
+        description='Parse AutoHotkey files and reparse them as they change.',
+    )
+    arg_parser.add_argument('directory', nargs='?', default='.')
+    arg_parser.add_argument('--pattern', default='*.ahk')
+    arg_parser.add_argument('--interval', type=float, default=0.5, help='seconds between polls')
+    arg_parser.add_argument(
+        '--once', action='store_true', help='parse everything once and exit (status 1 on errors)'
+    )
+    args = arg_parser.parse_args(argv)
+
+    watcher = Watcher(args.directory, args.pattern)
+    errors = watcher.report()
+    if args.once:
+        return 1 if errors else 0
+    try:
+        while True:
+            time.sleep(args.interval)
+            watcher.report()
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Compare decoding and tokenizing UTF-8 input with tokenizing the bytes directly, for a
+workload that only looks at token types.
+
+    python benchmarks/bench_bytes_tokenizer.py [lines]
+"""
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.bytes_tokenizer import tokenize_bytes
+from ahk_ast.tokenizer import tokenize
+
+BLOCK = '''\
+; réglages
+delay := 250
+title := "Sans titre - Bloc-notes"
+/* long
+   comment */
+WinActivate(title)
+Send "Hello, World!", delay
+'''
+
+
+def main(line_count: int) -> None:
+    data = (BLOCK * (line_count // BLOCK.count('\n'))).encode('utf-8')
+    print(f'{len(data)} bytes')
+
+    start = time.perf_counter()
+    decoded = Counter(tok.type for tok in tokenize(data.decode('utf-8')))
+    elapsed = time.perf_counter() - start
+    print(f'{"decode + tokenize()":<24} {elapsed * 1000:9.2f}ms')
+
+    start = time.perf_counter()
+    direct = Counter(tok.type for tok in tokenize_bytes(memoryview(data)))
+    elapsed = time.perf_counter() - start
+    print(f'{"tokenize_bytes()":<24} {elapsed * 1000:9.2f}ms')
+    assert decoded == direct
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
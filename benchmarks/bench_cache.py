@@ -0,0 +1,34 @@
+"""
+Compare cache hits with uncached parses for a repeated snippet.
+
+    python benchmarks/bench_cache.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.cache import ParseCache
+from ahk_ast.parser import parse
+
+SNIPPET = 'MsgBox "Hello, World!", title'
+
+
+def main(iterations: int) -> None:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(SNIPPET)
+    uncached = (time.perf_counter() - start) / iterations
+
+    cache = ParseCache()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        cache.parse(SNIPPET)
+    cached = (time.perf_counter() - start) / iterations
+
+    print(f'{"parse()":<20} {uncached * 1e6:9.2f}us per call')
+    print(f'{"ParseCache.parse()":<20} {cached * 1e6:9.2f}us per call  {cache.info()}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
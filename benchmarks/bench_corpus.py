@@ -0,0 +1,71 @@
+"""
+Compare tokenizing many small files one by one with tokenizing them from a packed corpus.
+
+    python benchmarks/bench_corpus.py [files]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.corpus import Corpus
+from ahk_ast.corpus import pack
+from ahk_ast.tokenizer import tokenize
+
+SCRIPT = '''\
+delay := 250
+title := "Untitled - Notepad"
+WinActivate(title)
+Send "Hello, World!", delay
+'''
+
+
+def main(count: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(count):
+            path = os.path.join(directory, f'script{i}.ahk')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(SCRIPT)
+            paths.append(path)
+
+        start = time.perf_counter()
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                f.read()
+        separate_read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                list(tokenize(f.read()))
+        separate = time.perf_counter() - start
+
+        archive = os.path.join(directory, 'scripts.ahkc')
+        start = time.perf_counter()
+        pack(paths, archive)
+        packing = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with Corpus(archive) as corpus:
+            for entry in corpus:
+                corpus.text(entry)
+        packed_read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with Corpus(archive) as corpus:
+            for _ in corpus.tokenize_all():
+                pass
+        packed = time.perf_counter() - start
+
+    print(f'{count} files')
+    print(f'{"open/read each file":<32} {separate_read * 1000:9.2f}ms')
+    print(f'{"read each file from corpus":<32} {packed_read * 1000:9.2f}ms')
+    print(f'{"open/read/tokenize each file":<32} {separate * 1000:9.2f}ms')
+    print(f'{"tokenize from corpus":<32} {packed * 1000:9.2f}ms')
+    print(f'{"pack (one-off)":<32} {packing * 1000:9.2f}ms')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
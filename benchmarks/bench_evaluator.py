@@ -0,0 +1,48 @@
+"""
+Compare evaluating a compiled expression with compiling it for every evaluation.
+
+    python benchmarks/bench_evaluator.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.evaluator import compile_expression
+from ahk_ast.evaluator import evaluate
+from ahk_ast.model import *
+
+# (width - 2 * margin) / columns > 100 && scale >= 1.5
+EXPRESSION = BinOp(
+    '&&',
+    Compare.gt(
+        BinOp(
+            '/',
+            Grouping(BinOp('-', Identifier('width'), BinOp('*', Integer(2), Identifier('margin')))),
+            Identifier('columns'),
+        ),
+        Integer(100),
+    ),
+    Compare.gte(Identifier('scale'), Float(1.5)),
+)
+ENVIRONMENT = {'width': 1920, 'margin': 16, 'columns': 4, 'scale': 2.0}
+
+
+def main(iterations: int) -> None:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        evaluate(EXPRESSION, ENVIRONMENT)
+    uncompiled = (time.perf_counter() - start) / iterations
+
+    compiled = compile_expression(EXPRESSION)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        compiled(ENVIRONMENT)
+    reused = (time.perf_counter() - start) / iterations
+
+    print(f'{"evaluate()":<24} {uncompiled * 1e6:9.2f}us per call')
+    print(f'{"compiled closure":<24} {reused * 1e6:9.2f}us per call')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
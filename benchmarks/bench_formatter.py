@@ -0,0 +1,56 @@
+"""
+Throughput benchmark for the formatter.
+
+Times document construction and layout separately for a program of many statements, including
+calls long enough to be broken across lines.
+
+    python benchmarks/bench_formatter.py [statements]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.formatter import Formatter
+from ahk_ast.formatter import render
+from ahk_ast.model import *
+
+
+def build_program(count: int) -> Program:
+    statements: list[Statement] = []
+    for i in range(count // 3):
+        statements.append(Assignment(Identifier(f'var{i}'), Integer(i)))
+        statements.append(
+            FunctionCallStatement(
+                Identifier('MsgBox'), [DoubleQuotedString(f'message {i}'), Identifier(f'var{i}')]
+            )
+        )
+        statements.append(
+            FunctionCall(
+                Identifier('SomeFunction'),
+                [DoubleQuotedString(f'a fairly long argument number {j}') for j in range(4)],
+            )
+        )
+    return Program(*statements)
+
+
+def main(count: int) -> None:
+    program = build_program(count)
+    formatter = Formatter()
+
+    start = time.perf_counter()
+    doc = formatter.doc(program)
+    built = time.perf_counter()
+    text = render(doc)
+    done = time.perf_counter()
+
+    print(f'{len(program.statements)} statements, {len(text)} characters formatted')
+    print(f'{"build document":<20} {(built - start) * 1000:9.2f}ms')
+    print(f'{"layout":<20} {(done - built) * 1000:9.2f}ms')
+    print(
+        f'{"total":<20} {(done - start) * 1000:9.2f}ms  {len(text) / (done - start) / 1e6:.2f}M chars/s'
+    )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
@@ -0,0 +1,70 @@
+"""
+Throughput benchmark for the highlighting API.
+
+Compares a full ``tokenize()`` pass with ``Highlighter`` over the whole file, then simulates
+scrolling through the file a screen at a time and redrawing a screen after an edit.
+
+    python benchmarks/bench_highlight.py [lines]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.highlight import Highlighter
+from ahk_ast.tokenizer import tokenize
+
+BLOCK = '''\
+; settings
+delay := 250
+title := "Untitled - Notepad"
+/* long
+   comment */
+WinActivate(title)
+Send "Hello, World!", delay
+'''
+
+SCREEN = 50
+
+
+def bench(label: str, func: object, chars: int) -> None:
+    start = time.perf_counter()
+    func()  # type: ignore[operator]
+    elapsed = time.perf_counter() - start
+    print(f'{label:<40} {elapsed * 1000:9.2f}ms  {chars / elapsed / 1e6:8.2f}M chars/s')
+
+
+def main(line_count: int) -> None:
+    text = BLOCK * (line_count // BLOCK.count('\n'))
+    chars = len(text)
+    print(f'{text.count(chr(10))} lines, {chars} characters')
+
+    bench('tokenize() (full file)', lambda: list(tokenize(text)), chars)
+    highlighter = Highlighter(text)
+    last = highlighter.line_count - 1
+    bench('Highlighter (full file, cold)', lambda: highlighter.highlight(0, last), chars)
+
+    def scroll() -> None:
+        for first in range(0, last, SCREEN):
+            highlighter.highlight(first, min(first + SCREEN - 1, last))
+
+    bench('Highlighter (scroll, warm)', scroll, chars)
+
+    middle = last // 2
+    edited = (
+        text[: text.index('\n', len(text) // 2)] + ' x' + text[text.index('\n', len(text) // 2) :]
+    )
+
+    def edit_and_redraw() -> None:
+        highlighter.set_text(edited)
+        highlighter.highlight(middle, middle + SCREEN - 1)
+
+    start = time.perf_counter()
+    edit_and_redraw()
+    print(
+        f'{"edit mid-file + redraw one screen":<40} {(time.perf_counter() - start) * 1000:9.2f}ms'
+    )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
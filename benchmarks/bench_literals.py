@@ -0,0 +1,59 @@
+"""
+Stress benchmark: tokenize scripts with multi-megabyte string and comment literals.
+
+Times ``tokenize()`` and, for reference, the single-character regex patterns that the
+string and block comment rules used before they were scanned with ``str.find``.
+
+    python benchmarks/bench_literals.py [megabytes]
+"""
+import os
+import sys
+import time
+
+import regex as re  # type: ignore[import]
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.tokenizer import tokenize
+
+REFERENCE_PATTERNS = {
+    'double quoted string': r'"(?:[^"`]|`.)*"',
+    'double quoted string (escapes)': r'"(?:[^"`]|`.)*"',
+    'single quoted string': r"'(?:[^'`]|`.)*'",
+    'block comment': r'/\*((.|\n))*?\*/',
+}
+
+
+def make_scripts(size: int) -> dict[str, str]:
+    blob = ('0123456789abcdef' * (size // 16 + 1))[:size]
+    escaped = ('ab`"cd`n' * (size // 8 + 1))[:size]
+    return {
+        'double quoted string': f'data := "{blob}"\n',
+        'double quoted string (escapes)': f'data := "{escaped}"\n',
+        'single quoted string': f"data := '{blob}'\n",
+        'block comment': f'/*\n{blob}\n*/\na := 1\n',
+    }
+
+
+def bench(label: str, func: object) -> None:
+    start = time.perf_counter()
+    try:
+        func()  # type: ignore[operator]
+    except (MemoryError, RecursionError) as e:
+        print(f'{label:<50} {time.perf_counter() - start:8.3f}s ({type(e).__name__})')
+    else:
+        print(f'{label:<50} {time.perf_counter() - start:8.3f}s')
+
+
+def main(megabytes: float) -> None:
+    size = int(megabytes * 1024 * 1024)
+    for name, script in make_scripts(size).items():
+        bench(f'tokenize: {name}', lambda: list(tokenize(script)))
+        pattern = REFERENCE_PATTERNS.get(name)
+        if pattern is not None:
+            start = script.index('/*' if pattern.startswith('/') else pattern[0])
+            compiled = re.compile(pattern, re.MULTILINE)
+            bench(f'reference regex: {name}', lambda: compiled.match(script, start))
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -0,0 +1,52 @@
+"""
+Compare the cost of handing a parsed program from a worker to its parent by pickling it with
+handing it over in shared memory. Both sides run in this process; parsing is not timed.
+
+    python benchmarks/bench_shared.py [statements]
+"""
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.columnar import ColumnarTree
+from ahk_ast.parser import parse
+from ahk_ast.shared import share
+from ahk_ast.shared import SharedTree
+
+LINES = ['a := 1', 'b := "Hello, World!"', 'MsgBox "Hello", a, b', 'Run("notepad.exe", "max")']
+
+
+def main(statements: int) -> None:
+    text = '\n'.join(LINES[i % len(LINES)] for i in range(statements)) + '\n'
+    program = parse(text)
+
+    start = time.perf_counter()
+    data = pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL)
+    dumped = time.perf_counter()
+    pickle.loads(data)
+    loaded = time.perf_counter()
+
+    tree = ColumnarTree()
+    tree.add(program)
+    added = time.perf_counter()
+    handle = share(tree)
+    shared = time.perf_counter()
+    with SharedTree.attach(handle) as attached:
+        nodes = len(attached)
+        attached_at = time.perf_counter()
+
+    print(f'{nodes} nodes')
+    print(
+        f'{"pickle":<14} worker {dumped - start:7.3f}s  parent {loaded - dumped:7.3f}s  '
+        f'{len(data)} bytes'
+    )
+    print(
+        f'{"shared memory":<14} worker {shared - loaded:7.3f}s  parent {attached_at - shared:7.3f}s  '
+        f'{handle.size} bytes  (ColumnarTree.add {added - loaded:.3f}s of the worker time)'
+    )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
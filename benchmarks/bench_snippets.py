@@ -0,0 +1,48 @@
+"""
+Microbenchmark: parse many one-line snippets in a loop.
+
+Compares constructing a new ``AHKParser`` for every snippet with the reusable
+per-thread parser used by ``ahk_ast.parse``.
+
+    python benchmarks/bench_snippets.py [count]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.parser import AHKParser
+from ahk_ast.parser import parse
+from ahk_ast.tokenizer import tokenize
+
+SNIPPETS = [
+    'a := 1',
+    'MsgBox "Hello AutoHotkey!"',
+    'Send("^c")',
+    'x := "some text"',
+    'Run "notepad.exe", , "Max"',
+]
+
+
+def fresh_parser(text: str) -> object:
+    return AHKParser().parse(tokenize(text))
+
+
+def bench(label: str, func: object, snippets: list[str]) -> None:
+    start = time.perf_counter()
+    for text in snippets:
+        func(text)  # type: ignore[operator]
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / len(snippets) * 1e6
+    print(f'{label:<20} {elapsed:8.3f}s  {per_call:8.2f}us/snippet')
+
+
+def main(count: int) -> None:
+    snippets = [SNIPPETS[i % len(SNIPPETS)] for i in range(count)]
+    print(f'parsing {count} one-line snippets')
+    bench('new AHKParser()', fresh_parser, snippets)
+    bench('ahk_ast.parse', parse, snippets)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,67 @@
+import asyncio
+import concurrent.futures
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast import aio
+from ahk_ast import parser
+from ahk_ast.aio import ParseService
+from ahk_ast.errors import AHKParsingException
+from ahk_ast.model import *
+
+
+def test_program_pickle_roundtrip():
+    model = parser.parse('a := 1\nMsgBox "Hello", b')
+    assert pickle.loads(pickle.dumps(model)) == model
+
+
+def test_service_parse():
+    async def main():
+        async with ParseService(max_workers=1) as service:
+            return await service.parse('a := 1')
+
+    model = asyncio.run(main())
+    assert model == Program(Assignment(location=Identifier(name='a'), value=Integer(value=1)))
+
+
+def test_service_parse_error():
+    async def main():
+        async with ParseService(max_workers=1) as service:
+            await service.parse('a := )')
+
+    with pytest.raises(AHKParsingException) as exc_info:
+        asyncio.run(main())
+    assert 'Was expecting expression in or near token RPAREN at: line 1' in str(exc_info.value)
+
+
+def test_stale_document_request_cancelled():
+    async def main():
+        async with ParseService(max_workers=1) as service:
+            return await asyncio.gather(
+                service.parse('a := 1', document='doc'),
+                service.parse('a := 2', document='doc'),
+                return_exceptions=True,
+            )
+
+    stale, latest = asyncio.run(main())
+    assert isinstance(stale, asyncio.CancelledError)
+    assert latest == Program(Assignment(location=Identifier(name='a'), value=Integer(value=2)))
+
+
+def test_aparse_from_several_event_loops(monkeypatch):
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(aio, '_default_service', ParseService(max_concurrency=2, executor=executor))
+
+    async def main():
+        return await asyncio.gather(*(aio.aparse(f'a := {i}') for i in range(40)))
+
+    try:
+        for _ in range(2):
+            models = asyncio.run(main())
+            assert models[-1] == Program(Assignment(Identifier('a'), Integer(39)))
+    finally:
+        executor.shutdown()
@@ -0,0 +1,100 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.batch import expand_paths
+from ahk_ast.batch import main
+from ahk_ast.batch import parse_file
+from ahk_ast.batch import parse_files
+
+
+@pytest.fixture
+def scripts(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'a.ahk').write_text('a := 1\nMsgBox "hi", a\n')
+    (tmp_path / 'sub' / 'b.ahk').write_text('b := \n')
+    return tmp_path
+
+
+def test_parse_file(scripts):
+    record = parse_file(str(scripts / 'a.ahk'))
+    assert record['status'] == 'ok'
+    assert record['error'] is None
+    assert record['node_counts'] == {
+        'Program': 1,
+        'Assignment': 1,
+        'Identifier': 3,
+        'Integer': 1,
+        'FunctionCallStatement': 1,
+        'DoubleQuotedString': 1,
+    }
+    assert record['nodes'] == 8
+    assert record['seconds'] >= 0
+
+    record = parse_file(str(scripts / 'sub' / 'b.ahk'))
+    assert record['status'] == 'error'
+    assert record['error']['type'] == 'AHKParsingException'
+    assert (record['error']['line'], record['error']['column']) == (1, 6)
+    assert record['nodes'] == 0
+
+    record = parse_file(str(scripts / 'missing.ahk'))
+    assert record['error']['type'] == 'FileNotFoundError'
+
+
+def test_parse_file_tokenize_error(tmp_path):
+    script = tmp_path / 'unterminated.ahk'
+    script.write_text('a := 1\nb := "oops\n')
+    record = parse_file(str(script))
+    assert record['error']['type'] == 'AHKTokenizeError'
+    assert (record['error']['line'], record['error']['column']) == (2, 6)
+
+
+def test_expand_paths(scripts):
+    pattern = str(scripts / '**' / '*.ahk')
+    missing = str(scripts / 'missing.ahk')
+    paths = expand_paths([pattern, missing, pattern])
+    assert paths == [str(scripts / 'a.ahk'), str(scripts / 'sub' / 'b.ahk'), missing]
+
+
+def test_expand_paths_skips_directories(scripts):
+    (scripts / 'sub' / 'c.ahk').mkdir()
+    assert expand_paths([str(scripts / '**')]) == [
+        str(scripts / 'a.ahk'),
+        str(scripts / 'sub' / 'b.ahk'),
+    ]
+
+
+def test_parse_files_pool(scripts):
+    paths = expand_paths([str(scripts / '**' / '*.ahk')])
+    records = list(parse_files(paths, max_workers=2))
+    assert sorted(record['path'] for record in records) == paths
+    assert {record['path']: record['status'] for record in records} == {
+        paths[0]: 'ok',
+        paths[1]: 'error',
+    }
+
+
+def test_main_writes_json_lines(scripts, capsys):
+    assert main(['-j', '1', str(scripts / 'a.ahk')]) == 0
+    assert main(['-j', '1', str(scripts / '**' / '*.ahk')]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)['status'] for line in lines] == ['ok', 'ok', 'error']
+
+
+def test_module_entry_point(scripts):
+    result = subprocess.run(
+        [sys.executable, '-m', 'ahk_ast', str(scripts / 'a.ahk')],
+        capture_output=True,
+        text=True,
+        cwd=scripts,
+        env={
+            **os.environ,
+            'PYTHONPATH': os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        },
+    )
+    assert result.returncode == 0
+    assert json.loads(result.stdout)['status'] == 'ok'
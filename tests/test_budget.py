@@ -0,0 +1,102 @@
+import os
+import pickle
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast import parser
+from ahk_ast.budget import Budget
+from ahk_ast.errors import AHKAstBaseException
+from ahk_ast.errors import AHKBudgetExceededError
+from ahk_ast.model import *
+from ahk_ast.tokenizer import tokenize
+
+
+def test_within_budget():
+    budget = Budget(max_input_size=100, max_tokens=100, max_depth=3, timeout=10)
+    assert parser.parse('MsgBox(1, "a")', budget=budget) == parser.parse('MsgBox(1, "a")')
+
+
+def test_max_input_size():
+    with pytest.raises(AHKBudgetExceededError) as exc_info:
+        parser.parse('a := 1\n' * 10, budget=Budget(max_input_size=20))
+    assert exc_info.value.limit == 'max_input_size'
+    assert exc_info.value.tokens == 0
+
+
+def test_max_tokens_records_progress():
+    with pytest.raises(AHKBudgetExceededError) as exc_info:
+        parser.parse('a := 1\nb := 2\nc := 3\n', budget=Budget(max_tokens=8))
+    error = exc_info.value
+    assert isinstance(error, AHKAstBaseException)
+    assert (error.limit, error.value, error.tokens) == ('max_tokens', 8, 8)
+    assert error.lineno == 2
+    assert error.index == 9
+
+
+def test_max_tokens_in_tokenizer():
+    with pytest.raises(AHKBudgetExceededError):
+        list(tokenize('a := 1 + 2', budget=Budget(max_tokens=3)))
+    assert len(list(tokenize('a := 1', budget=Budget(max_tokens=5)))) == 5
+
+
+def test_max_depth():
+    budget = Budget(max_depth=1)
+    parser.parse('f(1)\ng(2)', budget=budget)
+    # checked before the parser sees the token, so it also bounds input that fails to parse
+    with pytest.raises(AHKBudgetExceededError) as exc_info:
+        parser.parse('f(g(h(1)))', budget=budget)
+    assert exc_info.value.limit == 'max_depth'
+    assert exc_info.value.index == 3
+
+
+def test_max_depth_ignores_unbalanced_closing_brackets():
+    tokens = parser.get_parser()._token_gen(tokenize('))))(((('), Budget(max_depth=2))
+    with pytest.raises(AHKBudgetExceededError) as exc_info:
+        list(tokens)
+    assert exc_info.value.index == 6
+
+
+def test_max_depth_applies_to_tokens_from_any_source():
+    with pytest.raises(AHKBudgetExceededError):
+        parser.parse_tokens(tokenize('f(g(h(1)))'), budget=Budget(max_depth=1))
+
+
+def test_timeout():
+    budget = Budget(timeout=0.01)
+    tokens = list(tokenize('a := 1\n' * 200))
+
+    def slow_tokens():
+        for tok in tokens:
+            time.sleep(0.0001)
+            yield tok
+
+    with pytest.raises(AHKBudgetExceededError) as exc_info:
+        parser.parse_tokens(slow_tokens(), budget=budget)
+    error = exc_info.value
+    assert error.limit == 'timeout'
+    assert error.elapsed >= 0.01
+    assert 0 < error.tokens < len(tokens)
+
+
+def test_budget_is_reusable():
+    budget = Budget(timeout=0.05)
+    time.sleep(0.06)
+    parser.parse('a := 1\n' * 100, budget=budget)
+    assert budget.started_at is None
+
+
+def test_error_pickles():
+    error = AHKBudgetExceededError('max_tokens', 8, tokens=8, index=9, lineno=2, elapsed=0.5)
+    copy = pickle.loads(pickle.dumps(error))
+    assert (copy.limit, copy.value, copy.tokens, copy.index, copy.lineno, copy.elapsed) == (
+        'max_tokens',
+        8,
+        8,
+        9,
+        2,
+        0.5,
+    )
+    assert str(copy) == str(error)
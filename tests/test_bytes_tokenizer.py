@@ -0,0 +1,59 @@
+import mmap
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.bytes_tokenizer import tokenize_bytes
+from ahk_ast.errors import AHKTokenizeError
+from ahk_ast.tokenizer import tokenize
+
+SCRIPT = (
+    '﻿a := 1\n'
+    'MsgBox "héllo `"wörld`"", \'x\'\n'
+    '/* a block comment\n'
+    '   spanning lines */\n'
+    'x := "a string\n'
+    'spanning lines" ; inline comment ü\n'
+    '; line comment\n'
+    'Loop Count 3\n'
+    'loop  files\n'
+    'IfWinActive x <<= 2.5 / y\n'
+)
+
+
+def _tokens(tokens):
+    return [(tok.type, tok.value, tok.lineno) for tok in tokens]
+
+
+@pytest.mark.parametrize('convert', [bytes, bytearray, memoryview])
+def test_matches_tokenize(convert):
+    data = convert(SCRIPT.encode('utf-8'))
+    assert _tokens(tokenize_bytes(data)) == _tokens(tokenize(SCRIPT))
+
+
+def test_mmap_input(tmp_path):
+    path = tmp_path / 'script.ahk'
+    path.write_bytes(SCRIPT.encode('utf-8'))
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        assert _tokens(tokenize_bytes(data)) == _tokens(tokenize(SCRIPT))
+
+
+def test_byte_offsets():
+    data = 'é := "ü"'.encode('utf-8')
+    with pytest.raises(AHKTokenizeError, match="'é' at byte 0"):
+        list(tokenize_bytes(data))
+    tokens = list(tokenize_bytes('x := "ü"\n'.encode('utf-8')))
+    string = tokens[4]
+    assert (string.type, string.start, string.end) == ('DOUBLE_QUOTED_STRING', 5, 9)
+    assert string.raw == '"ü"'.encode('utf-8')
+    assert string.value == '"ü"'
+
+
+@pytest.mark.parametrize('text', ['x := "abc\n', "x := 'abc`'", '~ @'])
+def test_errors_match_tokenize(text):
+    with pytest.raises(AHKTokenizeError):
+        list(tokenize(text))
+    with pytest.raises(AHKTokenizeError):
+        list(tokenize_bytes(text.encode('utf-8')))
@@ -0,0 +1,70 @@
+import copy
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast import parser
+from ahk_ast.cache import CacheInfo
+from ahk_ast.cache import ParseCache
+from ahk_ast.errors import AHKFrozenNodeError
+from ahk_ast.errors import AHKParsingException
+from ahk_ast.model import *
+
+
+def test_hits_misses_and_evictions():
+    cache = ParseCache(maxsize=2)
+    a = cache.parse('a := 1')
+    assert cache.parse('a := 1') is a
+    assert a == parser.parse('a := 1')
+    cache.parse('b := 2')
+    cache.parse('a := 1')  # now most recently used
+    cache.parse('c := 3')  # evicts 'b := 2'
+    assert 'b := 2' not in cache
+    assert 'a := 1' in cache
+    assert cache.info() == CacheInfo(hits=2, misses=3, evictions=1, currsize=2, maxsize=2)
+    cache.clear()
+    assert cache.info() == CacheInfo(0, 0, 0, 0, 2)
+
+
+def test_errors_are_not_cached():
+    cache = ParseCache()
+    for _ in range(2):
+        with pytest.raises(AHKParsingException):
+            cache.parse('a := ')
+    assert cache.info().misses == 2
+    assert len(cache) == 0
+
+
+def test_cached_programs_are_frozen():
+    cache = ParseCache()
+    program = cache.parse('a := 1\nMsgBox "hi"')
+    assignment = program.statements[0]
+    with pytest.raises(AHKFrozenNodeError):
+        assignment.value = Integer(2)
+    with pytest.raises(AttributeError):
+        del assignment.location.name
+    assert cache.parse('a := 1\nMsgBox "hi"') == parser.parse('a := 1\nMsgBox "hi"')
+
+    mutable = copy.deepcopy(program)
+    mutable.statements[0].value = Integer(2)
+    assert mutable != program
+    assert (
+        pickle.loads(pickle.dumps(program)).statements[0].location.__dict__.get('_frozen') is None
+    )
+
+
+def test_freeze_converts_lists():
+    block = freeze(Block(Assignment(Identifier('a'), Integer(1))))
+    assert isinstance(block.statements, tuple)
+    assert is_frozen(block) and is_frozen(block.statements[0].value)
+    assert block.statements == (Assignment(Identifier('a'), Integer(1)),)
+
+
+def test_frozen_node_equals_mutable_copy():
+    block = Block(Assignment(Identifier('a'), Integer(1)), ReturnStatement(None))
+    assert freeze(copy.deepcopy(block)) == block
+    assert block == freeze(copy.deepcopy(block))
+    assert freeze(copy.deepcopy(block)) != Block(Assignment(Identifier('a'), Integer(1)))
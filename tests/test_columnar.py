@@ -0,0 +1,79 @@
+import os
+import sys
+from array import array
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast import parser
+from ahk_ast.columnar import _scan
+from ahk_ast.columnar import ColumnarTree
+from ahk_ast.model import *
+
+SCRIPT = '''\
+a := 1
+b := "Hello"
+MsgBox "Hello", a
+Run("notepad.exe")
+Run
+'''
+
+
+def test_roundtrip():
+    model = parser.parse(SCRIPT)
+    tree = ColumnarTree()
+    root = tree.add(model)
+    assert root.to_node() == model
+    assert len(tree) == len(list(walk(model)))
+
+
+def test_node_view_attributes():
+    tree = ColumnarTree()
+    root = tree.parse(SCRIPT)
+    assert root.node_type is Program
+    first, second, msgbox = root.statements[:3]
+    assert first.node_type is Assignment
+    assert first.location.name == 'a'
+    assert first.value.value == 1
+    assert second.value.value == 'Hello'
+    assert msgbox.func_location.name == 'MsgBox'
+    assert [arg.node_type for arg in msgbox.arguments] == [DoubleQuotedString, Identifier]
+    assert msgbox.parent == root
+
+
+def test_interned_values_shared():
+    tree = ColumnarTree()
+    tree.parse(SCRIPT)
+    tree.parse(SCRIPT)
+    assert len(tree.roots) == 2
+    assert tree.values.count(tree.values[tree.find(Identifier, name='Run')[0].index]) == 4
+    assert len(tree.interned) < len(tree) // 2
+
+
+def test_function_calls_query():
+    tree = ColumnarTree()
+    tree.parse(SCRIPT)
+    tree.parse('x := 2\nRun "calc.exe"')
+    calls = tree.function_calls('Run')
+    assert [call.node_type for call in calls] == [
+        FunctionCall,
+        FunctionCallStatement,
+        FunctionCallStatement,
+    ]
+    assert calls[0].arguments[0].value == 'notepad.exe'
+    assert calls[2].arguments[0].value == 'calc.exe'
+    assert tree.function_calls('Missing') == []
+
+
+def test_find_by_type_and_value():
+    tree = ColumnarTree()
+    tree.parse(SCRIPT)
+    assert [view.value for view in tree.find(String)] == ['Hello', 'Hello', 'notepad.exe']
+    assert len(tree.find(Integer, value=1)) == 1
+    assert tree.find(Bool, value=True) == []
+
+
+def test_scan_finds_aligned_items_of_any_value():
+    # 0x0100 followed by 0x0002 contains the bytes of 0x0201 at an odd offset (little endian)
+    column = array('H', [0x0100, 0x0002, 0x0201, 7, 0x0100])
+    assert _scan(column, 2, 'H', {0x0201, 0x0100}) == [0, 2, 4]
+    assert _scan(column, 2, 'H', set()) == []
+    column.append(1)  # the buffer is released after scanning
@@ -0,0 +1,78 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast import parser
+from ahk_ast.corpus import Corpus
+from ahk_ast.corpus import main
+from ahk_ast.corpus import pack
+from ahk_ast.errors import AHKCorpusError
+from ahk_ast.errors import AHKParsingException
+from ahk_ast.tokenizer import tokenize
+
+SCRIPTS = {
+    'a.ahk': 'a := 1\n',
+    'b.ahk': 'MsgBox "héllo", a\n',
+    'empty.ahk': '',
+    'bad.ahk': 'b := \n',
+}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    paths = []
+    for name, text in SCRIPTS.items():
+        path = tmp_path / name
+        path.write_text(text, encoding='utf-8')
+        paths.append(str(path))
+    archive = str(tmp_path / 'scripts.ahkc')
+    assert pack(paths, archive) == len(paths)
+    return archive
+
+
+def test_corpus_text(archive):
+    with Corpus(archive) as corpus:
+        assert len(corpus) == len(SCRIPTS)
+        assert [os.path.basename(entry.path) for entry in corpus] == list(SCRIPTS)
+        assert [corpus.text(entry) for entry in corpus] == list(SCRIPTS.values())
+        assert corpus.text(1) == SCRIPTS['b.ahk']
+
+
+def test_tokenize_all(archive):
+    with Corpus(archive) as corpus:
+        results = list(corpus.tokenize_all())
+    for (name, text), (path, tokens, error) in zip(SCRIPTS.items(), results):
+        assert path.endswith(name)
+        assert error is None
+        expected = [(t.type, t.value, t.lineno, t.index) for t in tokenize(text)]
+        assert [(t.type, t.value, t.lineno, t.index) for t in tokens] == expected
+
+
+def test_parse_all(archive):
+    with Corpus(archive) as corpus:
+        results = {
+            os.path.basename(path): (program, error) for path, program, error in corpus.parse_all()
+        }
+    assert results['a.ahk'] == (parser.parse(SCRIPTS['a.ahk']), None)
+    assert results['b.ahk'] == (parser.parse(SCRIPTS['b.ahk']), None)
+    assert results['empty.ahk'][0] is None
+    assert isinstance(results['bad.ahk'][1], AHKParsingException)
+
+
+def test_invalid_archive(tmp_path):
+    for content in (b'', b'not an archive at all'):
+        path = tmp_path / 'bad.ahkc'
+        path.write_bytes(content)
+        with pytest.raises(AHKCorpusError):
+            Corpus(str(path))
+
+
+def test_main(tmp_path, capsys):
+    (tmp_path / 'a.ahk').write_text('a := 1\n')
+    archive = str(tmp_path / 'out.ahkc')
+    assert main([archive, str(tmp_path / '*.ahk')]) == 0
+    assert 'packed 1 files' in capsys.readouterr().out
+    with Corpus(archive) as corpus:
+        assert corpus.text(0) == 'a := 1\n'
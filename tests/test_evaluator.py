@@ -0,0 +1,145 @@
+import copy
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast import parser
+from ahk_ast.errors import AHKEvaluationError
+from ahk_ast.evaluator import compile_expression
+from ahk_ast.evaluator import evaluate
+from ahk_ast.evaluator import fold
+from ahk_ast.evaluator import is_true
+from ahk_ast.model import *
+
+
+@pytest.mark.parametrize(
+    'expression, expected',
+    [
+        (BinOp('+', Integer(1), Integer(2)), 3),
+        (BinOp('-', Float(1.5), Integer(2)), -0.5),
+        (BinOp('*', String('3'), Integer(2)), 6),
+        (BinOp('/', Integer(6), Integer(3)), 2.0),
+        (BinOp('+', String('0x10'), Integer(0)), 16),
+        (UnaryOp('-', Grouping(BinOp('+', Integer(1), Integer(2)))), -3),
+        (UnaryOp('!', String('0')), True),
+        (UnaryOp('!', String('abc')), False),
+        (Compare.lt(String('10'), Integer(9)), False),
+        (Compare.lt(String('apple'), String('Banana')), True),
+        (BinOp('=', String('ABC'), String('abc')), True),
+        (Compare.eq(String('ABC'), String('abc')), False),
+        (BinOp('!=', String('ABC'), String('abd')), True),
+        (BinOp('!==', String('1'), Integer(1)), False),
+        (BinOp('&&', Integer(2), String('yes')), 'yes'),
+        (BinOp('&&', String(''), String('yes')), ''),
+        (BinOp('||', Integer(0), String('no')), 'no'),
+        (DoubleQuotedString('tab`there `"quoted`"'), 'tab\there "quoted"'),
+    ],
+)
+def test_evaluate_literals(expression, expected):
+    value = evaluate(expression)
+    assert value == expected and type(value) is type(expected)
+
+
+def test_identifiers_resolve_through_environment():
+    expression = BinOp('*', Identifier('Width'), Identifier('scale'))
+    assert evaluate(expression, {'Width': 800, 'scale': 2}) == 1600
+    # variable names are case-insensitive
+    assert evaluate(expression, {'width': 800, 'SCALE': 2}) == 1600
+    with pytest.raises(AHKEvaluationError, match='scale'):
+        evaluate(expression, {'width': 800})
+
+
+def test_field_lookup_and_calls():
+    settings = {'window': {'title': 'Notepad'}}
+    lookup = FieldLookup(Identifier('settings'), 'window')
+    assert evaluate(FieldLookup(lookup, 'title'), {'settings': settings}) == 'Notepad'
+    call = FunctionCall(Identifier('Max'), [Integer(1), Identifier('x')])
+    assert evaluate(call, {'Max': max, 'x': 5}) == 5
+    with pytest.raises(AHKEvaluationError, match='not callable'):
+        evaluate(call, {'Max': 1, 'x': 5})
+
+
+def test_compiled_expression_is_reusable():
+    compiled = compile_expression(BinOp('+', Identifier('x'), Integer(1)))
+    assert [compiled({'x': x}) for x in range(3)] == [1, 2, 3]
+
+
+def test_short_circuit():
+    calls = []
+    environment = {'f': lambda: calls.append(1) or 1}
+    call = FunctionCall(Identifier('f'), None)
+    assert evaluate(BinOp('&&', Identifier('zero'), call), dict(environment, zero=0)) == 0
+    assert evaluate(BinOp('||', Identifier('one'), call), dict(environment, one=1)) == 1
+    assert calls == []
+
+
+@pytest.mark.parametrize(
+    'expression',
+    [
+        BinOp('-', String('abc'), Integer(1)),
+        BinOp('/', Integer(1), Integer(0)),
+        Program(Assignment(Identifier('a'), Integer(1))),
+    ],
+)
+def test_evaluation_errors(expression):
+    with pytest.raises(AHKEvaluationError):
+        evaluate(expression)
+
+
+def test_fold_constants():
+    expression = BinOp(
+        '+',
+        Identifier('x'),
+        Grouping(BinOp('*', Integer(2), BinOp('-', Integer(5), Integer(2)))),
+    )
+    assert fold(expression) == BinOp('+', Identifier('x'), Integer(6))
+    assert fold(BinOp('+', String('0x10'), Float(0.5))) == Float(16.5)
+    assert fold(Compare.gt(Integer(2), Integer(1))) == Bool(True)
+    assert fold(BinOp('&&', Integer(0), Identifier('x'))) == Integer(0)
+    assert fold(BinOp('||', Integer(0), Identifier('x'))) == Identifier('x')
+
+
+def test_fold_leaves_failing_operations():
+    expression = BinOp('/', Integer(1), Integer(0))
+    assert fold(expression) is expression
+
+
+def test_fold_does_not_modify_tree():
+    program = freeze(
+        Program(
+            Assignment(Identifier('a'), BinOp('+', Integer(1), Integer(2))),
+            Assignment(Identifier('b'), Identifier('a')),
+        )
+    )
+    folded = fold(program)
+    assert folded.statements[0].value == Integer(3)
+    assert folded.statements[1] is program.statements[1]
+    assert program.statements[0].value == BinOp('+', Integer(1), Integer(2))
+
+
+def test_fold_parsed_program_is_unchanged():
+    program = parser.parse('a := 1\nMsgBox "hi", a\n')
+    assert fold(program) is program
+
+
+def test_fold_groupings_of_literals():
+    expression = BinOp('&&', Grouping(String('a`tb')), Identifier('x'))
+    assert fold(expression) == Identifier('x')
+    assert fold(Grouping(Grouping(String('a`tb')))) == String('a`tb')
+
+
+def test_is_true():
+    assert [is_true(value) for value in ('', '0', '0.0', ' 0 ', 'x', 0, 0.0, 1, -1)] == [
+        False,
+        False,
+        False,
+        False,
+        True,
+        False,
+        False,
+        True,
+        True,
+    ]
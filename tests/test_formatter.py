@@ -0,0 +1,151 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast import parser
+from ahk_ast.errors import AHKFormatError
+from ahk_ast.formatter import format_node
+from ahk_ast.formatter import format_source
+from ahk_ast.formatter import main
+from ahk_ast.model import *
+
+
+@pytest.mark.parametrize(
+    'source, expected',
+    [
+        ('a:=1', 'a := 1\n'),
+        ('MsgBox   "hi",x , \'y\'\n\n', 'MsgBox "hi", x, \'y\'\n'),
+        ('f( 1,2 )\nx\ng()', 'f(1, 2)\nx\ng()\n'),
+    ],
+)
+def test_format_source(source, expected):
+    assert format_source(source) == expected
+    assert format_source(expected) == expected
+    assert parser.parse(expected) == parser.parse(source)
+
+
+def test_long_calls_break_at_continuation_points():
+    arguments = [f'"argument number {i}"' for i in range(4)]
+    statement = FunctionCallStatement(Identifier('MsgBox'), [String(a[1:-1]) for a in arguments])
+    assert format_node(statement, width=40) == 'MsgBox ' + '\n    , '.join(arguments)
+    call = FunctionCall(Identifier('f'), [String(a[1:-1]) for a in arguments])
+    assert format_node(call, width=40) == 'f(\n    ' + ',\n    '.join(arguments) + '\n)'
+    # a group that fits stays on one line even when the enclosing one breaks
+    nested = FunctionCall(
+        Identifier('f'), [FunctionCall(Identifier('g'), [Integer(1)]), String('x' * 30)]
+    )
+    assert format_node(nested, width=20) == 'f(\n    g(1),\n    "' + 'x' * 30 + '"\n)'
+
+
+def test_format_other_nodes():
+    program = Program(
+        IfStatement(
+            BinOp('&&', Identifier('a'), Grouping(BinOp('+', Integer(1), Float(2.5)))),
+            Block(Assignment(FieldLookup(Identifier('p'), 'x'), Bool(True)), ReturnStatement(None)),
+            Block(BreakStatement()),
+        ),
+        FunctionDefinition(
+            'f',
+            [Parameter('a'), Parameter('b')],
+            Block(ReturnStatement(UnaryOp('-', Identifier('a')))),
+        ),
+        HotkeyDefinition(
+            Hotkey('a', '^!'), FunctionCallStatement(Identifier('Send'), [SingleQuotedString('x')])
+        ),
+    )
+    assert format_node(program) == (
+        'if a && (1 + 2.5) {\n'
+        '    p.x := true\n'
+        '    return\n'
+        '} else {\n'
+        '    break\n'
+        '}\n'
+        'f(a, b) {\n'
+        '    return -a\n'
+        '}\n'
+        "^!a::Send 'x'\n"
+    )
+
+
+def test_format_source_breaks_long_lines():
+    arguments = [f'"argument number {i}"' for i in range(4)]
+    call = 'f(' + ', '.join(arguments) + ')\n'
+    statement = 'MsgBox ' + ', '.join(arguments) + '\n'
+    source = call + statement
+    formatted = format_source(source, width=40)
+    assert formatted == (
+        'f(\n    '
+        + ',\n    '.join(arguments)
+        + '\n)\n'
+        + 'MsgBox '
+        + '\n    , '.join(arguments)
+        + '\n'
+    )
+    assert parser.parse(formatted) == parser.parse(source)
+    assert format_source(formatted, width=40) == formatted
+    assert format_source(formatted) == source
+
+
+@pytest.mark.parametrize('source', ['Run "notepad.exe", , "Max"\n', 'f(1, , 2)\n', 'Run "x",\n'])
+def test_format_source_refuses_to_drop_empty_arguments(source):
+    with pytest.raises(AHKFormatError):
+        format_source(source)
+
+
+@pytest.mark.parametrize(
+    'node, expected',
+    [
+        (BinOp('*', BinOp('+', Identifier('a'), Identifier('b')), Identifier('c')), '(a + b) * c'),
+        (BinOp('+', Identifier('a'), BinOp('*', Identifier('b'), Identifier('c'))), 'a + b * c'),
+        (BinOp('-', Identifier('a'), BinOp('-', Identifier('b'), Identifier('c'))), 'a - (b - c)'),
+        (BinOp('-', BinOp('-', Identifier('a'), Identifier('b')), Identifier('c')), 'a - b - c'),
+        (
+            BinOp('&&', BinOp('||', Identifier('a'), Bool(True)), Bool(False)),
+            '(a || true) && false',
+        ),
+        (UnaryOp('-', BinOp('+', Identifier('a'), Integer(1))), '-(a + 1)'),
+        (UnaryOp('-', UnaryOp('-', Identifier('a'))), '- -a'),
+        (UnaryOp('-', Integer(-1)), '- -1'),
+        (UnaryOp('+', Float(-1.5)), '+ -1.5'),
+        (UnaryOp('!', UnaryOp('-', Identifier('a'))), '!-a'),
+    ],
+)
+def test_format_operators(node, expected):
+    assert format_node(node) == expected
+
+
+def test_format_floats():
+    assert format_node(Float(1e20)) == '100000000000000000000.0'
+    assert format_node(Float(1.5e-7)) == '0.00000015'
+    assert format_node(Float(3.0)) == '3.0'
+    for value in (float('inf'), float('-inf'), float('nan')):
+        with pytest.raises(AHKFormatError):
+            format_node(Float(value))
+
+
+def test_unformattable_node():
+    with pytest.raises(AHKFormatError):
+        format_node(ForLoop(Identifier('x'), Identifier('y')))
+
+
+def test_main(tmp_path, capsys):
+    clean = tmp_path / 'clean.ahk'
+    clean.write_text('a := 1\n')
+    messy = tmp_path / 'messy.ahk'
+    messy.write_text('a:=1\n')
+    assert main(['--check', str(clean), str(messy)]) == 1
+    assert messy.read_text() == 'a:=1\n'
+    assert main([str(clean), str(messy)]) == 1
+    assert messy.read_text() == 'a := 1\n'
+    assert main([str(clean), str(messy)]) == 0
+    assert 'messy.ahk' in capsys.readouterr().out
+
+
+def test_main_does_not_rewrite_unsafe_files(tmp_path, capsys):
+    script = tmp_path / 'empty_argument.ahk'
+    script.write_text('Run "notepad.exe", , "Max"\n')
+    assert main([str(script)]) == 1
+    assert script.read_text() == 'Run "notepad.exe", , "Max"\n'
+    assert 'cannot format' in capsys.readouterr().err
@@ -0,0 +1,70 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.highlight import Highlighter
+from ahk_ast.tokenizer import tokenize
+
+SCRIPT = (
+    'a := 1\n'
+    'Loop Count 3\n'
+    'loop  files\n'
+    'IfWinActive x\n'
+    '/* a block comment\n'
+    '   spanning lines\n'
+    '*/\n'
+    'x := "a string\n'
+    'spanning lines"\n'
+    "; it's a comment\n"
+    'f(1, 2)\n'
+)
+
+
+def _spans(text):
+    return [(tok.index, tok.index + len(tok.value), tok.type) for tok in tokenize(text)]
+
+
+def test_highlight_matches_tokenize():
+    highlighter = Highlighter(SCRIPT)
+    assert highlighter.highlight(0, highlighter.line_count - 1) == _spans(SCRIPT)
+
+
+def test_highlight_line_range():
+    highlighter = Highlighter(SCRIPT)
+    spans = highlighter.highlight(5)
+    # the block comment starts on line 4 but covers line 5
+    assert spans == [(SCRIPT.index('/*'), SCRIPT.index('*/') + 2, 'BLOCK_COMMENT')]
+    assert highlighter.highlight(1) == [
+        (7, 17, 'LOOP_COUNT'),
+        (17, 18, 'WHITESPACE'),
+        (18, 19, 'INTEGER'),
+        (19, 20, 'NEWLINE'),
+    ]
+    with pytest.raises(IndexError):
+        highlighter.highlight(0, highlighter.line_count)
+
+
+def test_edit_invalidates_later_lines():
+    text = 'a := 1\n/* open\nb := 2\nc := 3\n'
+    highlighter = Highlighter(text)
+    assert [kind for _, _, kind in highlighter.highlight(2)][0] == 'NAME'
+    # closing the comment after line 2 changes how lines 1 and 2 are lexed
+    edited = text + '*/\n'
+    highlighter.set_text(edited)
+    assert highlighter.highlight(2)[0][2] == 'BLOCK_COMMENT'
+    assert highlighter.highlight(0, highlighter.line_count - 1) == _spans(edited)
+    highlighter.set_text(text)
+    assert highlighter.highlight(0, highlighter.line_count - 1) == Highlighter(text).highlight(
+        0, highlighter.line_count - 1
+    )
+
+
+def test_unterminated_string_and_error():
+    highlighter = Highlighter('a := "abc\nb := 1 §\n')
+    assert highlighter.highlight(0)[-2:] == [
+        (5, 9, 'UNTERMINATED_DOUBLE_QUOTE_STRING'),
+        (9, 10, 'NEWLINE'),
+    ]
+    assert (17, 18, 'ERROR') in highlighter.highlight(1)
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast import parser
+from ahk_ast.model import *
+
+
+@pytest.mark.parametrize(
+    'raw, expected',
+    [
+        ('no escapes', 'no escapes'),
+        ('a`nb`tc', 'a\nb\tc'),
+        ('say `"hi`"', 'say "hi"'),
+        ("it`'s", "it's"),
+        ('back``tick', 'back`tick'),
+        ('`;`:`{`s', ';:{ '),
+        ('`r`b`v`a`f', '\r\b\v\a\f'),
+        ('trailing`', 'trailing`'),
+    ],
+)
+def test_unescape(raw, expected):
+    assert unescape(raw) == expected
+
+
+def test_string_unescaped_value():
+    model = parser.parse('MsgBox "Line 1`nLine 2"')
+    string = model.statements[0].arguments[0]
+    assert string.value == 'Line 1`nLine 2'
+    assert string.unescaped_value == 'Line 1\nLine 2'
+    assert string.unescaped_value is string.unescaped_value
+    assert string == DoubleQuotedString(value='Line 1`nLine 2')
+
+
+def test_string_unescaped_value_follows_changes():
+    string = SingleQuotedString(value='a`tb')
+    assert string.unescaped_value == 'a\tb'
+    string.value = 'c`td'
+    assert string.unescaped_value == 'c\td'
+    string.value = 'plain'
+    assert string.unescaped_value == 'plain'
+
+
+def test_from_parser_skips_validation():
+    with pytest.raises(AssertionError):
+        Integer(value='1')
+    node = Integer._from_parser(value='1')
+    assert type(node) is Integer
+    assert node.value == '1'
+
+
+def test_parser_output_matches_validated_construction():
+    model = parser.parse('a := 1\nMsgBox("Hello", a)\nMsgBox')
+    expected = Program(
+        Assignment(location=Identifier(name='a'), value=Integer(value=1)),
+        FunctionCall(
+            func_location=Identifier(name='MsgBox'),
+            arguments=[DoubleQuotedString(value='Hello'), Identifier(name='a')],
+        ),
+        FunctionCallStatement(func_location=Identifier(name='MsgBox'), arguments=None),
+    )
+    assert model == expected
+    assert repr(model) == repr(expected)
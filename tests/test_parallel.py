@@ -0,0 +1,56 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.errors import AHKTokenizeError
+from ahk_ast.parallel import tokenize_parallel
+from ahk_ast.tokenizer import tokenize
+
+
+def _tokens(tokens):
+    return [(tok.type, tok.value, tok.lineno, tok.index) for tok in tokens]
+
+
+SCRIPT = (
+    'a := 1\n'
+    'MsgBox "Hello", "World"\n'
+    '/* a block comment\n'
+    '   spanning lines\n'
+    '*/\n'
+    'x := "a string\n'
+    'spanning lines"\n'
+    "; it's a comment\n"
+    'f(1, 2)\n'
+) * 5
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 30, 100])
+def test_tokenize_parallel_matches_tokenize(chunk_size):
+    with ThreadPoolExecutor(2) as executor:
+        result = _tokens(tokenize_parallel(SCRIPT, chunk_size=chunk_size, executor=executor))
+    assert result == _tokens(tokenize(SCRIPT))
+
+
+def test_tokenize_parallel_process_pool():
+    result = _tokens(tokenize_parallel(SCRIPT, max_workers=2, chunk_size=40))
+    assert result == _tokens(tokenize(SCRIPT))
+
+
+def test_tokenize_parallel_unterminated_block_comment():
+    script = 'a := 1\n/* not closed\nb := 2\n' * 3
+    with ThreadPoolExecutor(2) as executor:
+        result = _tokens(tokenize_parallel(script, chunk_size=5, executor=executor))
+    assert result == _tokens(tokenize(script))
+
+
+def test_tokenize_parallel_error():
+    script = 'a := 1\n' * 10 + 'b := "unterminated\n' + 'c := 3\n' * 10
+    with ThreadPoolExecutor(2) as executor:
+        with pytest.raises(AHKTokenizeError) as exc_info:
+            list(tokenize_parallel(script, chunk_size=10, executor=executor))
+    with pytest.raises(AHKTokenizeError) as expected:
+        list(tokenize(script))
+    assert str(exc_info.value) == str(expected.value)
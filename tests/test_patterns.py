@@ -0,0 +1,102 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast import parser
+from ahk_ast.errors import AHKParsingException
+from ahk_ast.errors import AHKPatternError
+from ahk_ast.model import *
+from ahk_ast.patterns import Pattern
+from ahk_ast.patterns import PatternSet
+
+SCRIPT = '''\
+Run("notepad.exe")
+run("calc.exe")
+MsgBox("x")
+Send "a", "b", "c", "d"
+Send "a"
+'''
+
+
+def _call(name, *arguments):
+    return FunctionCall(func_location=Identifier(name=name), arguments=arguments)
+
+
+# the parser does not support function calls in expressions yet
+ASSIGNMENTS = Program(
+    Assignment(location=Identifier(name='a'), value=_call('Run', DoubleQuotedString('x.exe'))),
+    Assignment(location=Identifier(name='b'), value=_call('run')),
+    Assignment(location=Identifier(name='c'), value=_call('MsgBox')),
+    Assignment(location=Identifier(name='d'), value=Identifier(name='Run')),
+)
+
+
+def test_nested_pattern():
+    pattern = Pattern("Assignment(value=FunctionCall(func_location=Identifier(name='Run')))")
+    found = pattern.find_all(ASSIGNMENTS)
+    assert [node.location.name for node in found] == ['a']
+
+
+def test_nocase_and_alternatives():
+    pattern = Pattern(
+        "Assignment(value=FunctionCall(func_location=Identifier(name=nocase('run') | 'MsgBox')))"
+    )
+    found = pattern.find_all(ASSIGNMENTS)
+    assert [node.location.name for node in found] == ['a', 'b', 'c']
+
+
+def test_regex():
+    pattern = Pattern("DoubleQuotedString(value=re('\\\\.exe$'))")
+    found = pattern.find_all(parser.parse(SCRIPT))
+    assert [node.value for node in found] == ['notepad.exe', 'calc.exe']
+
+
+def test_sequence_patterns():
+    model = parser.parse(SCRIPT)
+    assert len(Pattern('FunctionCallStatement(arguments=len > 3)').find_all(model)) == 1
+    assert len(Pattern('FunctionCallStatement(arguments=[_])').find_all(model)) == 1
+    assert len(Pattern('FunctionCallStatement(arguments=[_, _, ...])').find_all(model)) == 1
+    exact = Pattern("FunctionCall(arguments=[DoubleQuotedString(value='x')])")
+    assert len(exact.find_all(model)) == 1
+
+
+def test_pattern_set_indexes_by_root_type():
+    patterns = PatternSet(
+        {
+            'run': "FunctionCall(func_location=Identifier(name=nocase('run')))",
+            'many-args': 'FunctionCallStatement(arguments=len >= 4)',
+            'identifier': '_',
+        }
+    )
+    matches = patterns.scan(parser.parse(SCRIPT))
+    names = [match.pattern.name for match in matches if match.pattern.name != 'identifier']
+    assert names == ['run', 'run', 'many-args']
+    assert len([m for m in matches if m.pattern.name == 'identifier']) == len(
+        list(walk(parser.parse(SCRIPT)))
+    )
+    assert patterns._candidates(Integer) == (2,)
+
+
+def test_scan_files(tmp_path):
+    good = tmp_path / 'good.ahk'
+    good.write_text(SCRIPT)
+    bad = tmp_path / 'bad.ahk'
+    bad.write_text('a := )')
+    patterns = PatternSet(["FunctionCall(func_location=Identifier(name='Run'))"])
+    results = list(patterns.scan_files([str(good), str(bad)], max_workers=1))
+    assert [result.path for result in results] == [str(good), str(bad)]
+    assert len(results[0].matches) == 1
+    assert results[0].matches[0].pattern is patterns.patterns[0]
+    assert results[0].matches[0].node.arguments[0].value == 'notepad.exe'
+    assert isinstance(results[1].error, AHKParsingException)
+
+
+@pytest.mark.parametrize(
+    'source',
+    ['Nope()', 'Assignment(1)', 'foo', 'len > 1 > 2', 'Assignment(value=', "re('(')", 'x + 1'],
+)
+def test_invalid_patterns(source):
+    with pytest.raises(AHKPatternError):
+        Pattern(source)
@@ -64,3 +64,89 @@ def test_leading_lines_ws():
     )
     model = parser.parse(script)
     assert model == expected
+
+
+def test_parser_reused_without_leftover_state():
+    p = parser.get_parser()
+    parser.parse('a := 1')
+    assert parser.get_parser() is p
+    with pytest.raises(parser.AHKParsingException):
+        parser.parse('a := )')
+
+    observed = []
+
+    def tokens():
+        for tok in tokenize('b := 2'):
+            observed.append(([t.value for t in p.seen_tokens], list(p.expecting)))
+            yield tok
+
+    model = p.parse(tokens())
+    assert model == Program(Assignment(location=Identifier(name='b'), value=Integer(value=2)))
+    # nothing from the failed parse is visible while parsing the next input
+    assert observed[0] == ([], [])
+    assert observed[-1][0] == ['b', ' ', ':=', ' ']
+
+
+def test_parser_releases_tokens_after_parse():
+    p = parser.get_parser()
+    parser.parse('a := 1\n' * 100)
+    assert p.seen_tokens == [] and p.last_token is None and p.expecting == []
+    with pytest.raises(parser.AHKParsingException):
+        parser.parse('a := )')
+    assert p.seen_tokens == [] and p.last_token is None and p.expecting == []
+
+
+@pytest.mark.parametrize(
+    'script',
+    [
+        'f(\n    1,\n    "two"\n)',
+        'f(1 ,\n  "two")',
+        'f 1\n    , "two"',
+        'f 1 \n  , "two"',
+    ],
+)
+def test_continuation_lines(script):
+    call = parser.parse(script).statements[0]
+    assert call.arguments == (Integer(1), DoubleQuotedString('two'))
+
+
+@pytest.mark.parametrize('script', ['f(1\n, 2\n', 'x := 1\nf(1,\n    2\n'])
+def test_unclosed_bracket_reported_where_it_opens(script):
+    with pytest.raises(parser.AHKParsingException) as exc_info:
+        parser.parse(script)
+    assert 'Missing closing bracket' in str(exc_info.value)
+    assert exc_info.value.lineno == script.count('\n', 0, script.index('(')) + 1
+
+
+def test_unclosed_bracket_named_in_later_errors():
+    with pytest.raises(parser.AHKParsingException) as exc_info:
+        parser.parse('x := 1\nf(1,\n    2\n\ny := 2\n')
+    assert "the '(' on line 2 is not closed" in str(exc_info.value)
+    assert exc_info.value.lineno == 5
+
+
+def test_line_breaks_kept_inside_braces_within_parentheses():
+    tokens = parser.join_continuation_lines(tokenize('f({\na\n}\n)\nb'))
+    assert [tok.type for tok in tokens] == [
+        'NAME',
+        'LPAREN',
+        'LBRACE',
+        'NEWLINE',
+        'NAME',
+        'NEWLINE',
+        'RBRACE',
+        'RPAREN',
+        'NEWLINE',
+        'NAME',
+    ]
+    # a closing bracket of another kind does not close the parentheses
+    tokens = parser.join_continuation_lines(tokenize('f(}\n1)\nb'))
+    assert [tok.type for tok in tokens] == [
+        'NAME',
+        'LPAREN',
+        'RBRACE',
+        'INTEGER',
+        'RPAREN',
+        'NEWLINE',
+        'NAME',
+    ]
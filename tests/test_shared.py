@@ -0,0 +1,111 @@
+import os
+import sys
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast import parser
+from ahk_ast import shared as shared_module
+from ahk_ast.columnar import ColumnarTree
+from ahk_ast.errors import AHKParsingException
+from ahk_ast.errors import AHKSharedMemoryError
+from ahk_ast.model import *
+from ahk_ast.shared import parse_files
+from ahk_ast.shared import parse_shared
+from ahk_ast.shared import share
+from ahk_ast.shared import SharedTree
+from ahk_ast.shared import SharedTreeHandle
+
+SCRIPT = '''\
+a := 1
+b := "Hello"
+MsgBox "Hello", a
+Run("notepad.exe")
+'''
+
+
+def test_roundtrip():
+    tree = ColumnarTree()
+    tree.parse(SCRIPT)
+    tree.parse('Run "calc.exe"')
+    with SharedTree.attach(share(tree)) as shared:
+        assert len(shared) == len(tree)
+        assert list(shared.roots) == list(tree.roots)
+        assert shared[0].to_node() == parser.parse(SCRIPT)
+        assert shared[shared.roots[1]].to_node() == parser.parse('Run "calc.exe"')
+        calls = shared.function_calls('Run')
+        assert [call.arguments[0].value for call in calls] == ['notepad.exe', 'calc.exe']
+        assert [view.location.name for view in shared.find(Assignment)] == ['a', 'b']
+
+
+def test_views_are_read_only():
+    with SharedTree.attach(parse_shared(SCRIPT)) as shared:
+        assert isinstance(shared.kinds, memoryview)
+        with pytest.raises(TypeError):
+            shared.parents[1] = 0
+        with pytest.raises(TypeError):
+            shared.add(Program())
+
+
+def test_creator_keeps_block_open_until_attached():
+    handle = parse_shared(SCRIPT)
+    assert handle.name in shared_module._created_blocks
+    with SharedTree.attach(handle):
+        other = parse_shared(SCRIPT)
+        assert handle.name not in shared_module._created_blocks
+        assert other.name in shared_module._created_blocks
+    SharedTree.attach(other).close()
+
+
+def test_close_unlinks_block():
+    handle = parse_shared(SCRIPT)
+    shared = SharedTree.attach(handle)
+    shared.close()
+    shared.close()
+    with pytest.raises(AHKSharedMemoryError):
+        SharedTree.attach(handle)
+
+
+def test_attach_rejects_other_blocks():
+    block = SharedMemory(create=True, size=64)
+    try:
+        block.buf[:4] = b'nope'
+        with pytest.raises(AHKSharedMemoryError):
+            SharedTree.attach(SharedTreeHandle(block.name, 64))
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_empty_tree():
+    with SharedTree.attach(share(ColumnarTree())) as shared:
+        assert len(shared) == 0
+        assert shared.function_calls('Run') == []
+
+
+def test_parse_files_spawn(tmp_path):
+    texts = {}
+    for i in range(4):
+        path = tmp_path / f'{i}.ahk'
+        texts[str(path)] = f'a := {i}\n'
+        path.write_text(texts[str(path)])
+    results = list(parse_files(list(texts), 2, mp_context=get_context('spawn')))
+    assert sorted(result.path for result in results) == sorted(texts)
+    for result in results:
+        with result.tree as shared:
+            assert shared[0].to_node() == parser.parse(texts[result.path])
+
+
+def test_parse_files(tmp_path):
+    good = tmp_path / 'good.ahk'
+    good.write_text(SCRIPT)
+    bad = tmp_path / 'bad.ahk'
+    bad.write_text('a := \n')
+    results = {result.path: result for result in parse_files([str(good), str(bad)], 2)}
+    with results[str(good)].tree as shared:
+        assert results[str(good)].error is None
+        assert shared[0].to_node() == parser.parse(SCRIPT)
+    assert results[str(bad)].tree is None
+    assert isinstance(results[str(bad)].error, AHKParsingException)
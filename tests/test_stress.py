@@ -0,0 +1,83 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast import parser
+from ahk_ast import stress
+from ahk_ast.tokenizer import AHKLexer
+from ahk_ast.tokenizer import tokenize
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_generated_programs_parse(seed):
+    text = stress.generate_program(random.Random(seed), 50)
+    program = parser.parse(text)
+    assert len(program.statements) == 50
+
+
+def test_generator_is_reproducible():
+    assert stress.generate_program(random.Random(3), 20) == stress.generate_program(
+        random.Random(3), 20
+    )
+
+
+def test_fit_slope():
+    sizes = [10, 100, 1000]
+    assert stress.fit_slope(sizes, [size * 1e-6 for size in sizes]) == pytest.approx(1)
+    assert stress.fit_slope(sizes, [size**2 * 1e-9 for size in sizes]) == pytest.approx(2)
+
+
+def test_run_reports_every_phase():
+    results = stress.run(['program', 'many_strings'], base=5, scales=(1, 2), repeat=1)
+    assert [(result.construct, result.phase) for result in results] == [
+        ('program', 'tokenize'),
+        ('program', 'parse'),
+        ('many_strings', 'tokenize'),
+        ('many_strings', 'parse'),
+    ]
+    assert all(result.sizes == (5, 10) for result in results)
+
+
+def test_run_saves_flagged_inputs(tmp_path):
+    results = stress.run(
+        ['long_string'],
+        base=5,
+        scales=(1, 2),
+        threshold=-100,
+        min_seconds=0,
+        repeat=1,
+        save=str(tmp_path),
+    )
+    assert all(result.flagged for result in results)
+    saved = tmp_path / 'long_string-10.ahk'
+    assert saved.read_text() == stress.CONSTRUCTS['long_string'](random.Random(0), 10)
+
+
+def test_many_unterminated_block_comments():
+    tokens = list(tokenize('/* x /* y'))
+    assert [tok.type for tok in tokens] == [
+        'DIVIDE',
+        'TIMES',
+        'WHITESPACE',
+        'NAME',
+        'WHITESPACE',
+        'DIVIDE',
+        'TIMES',
+        'WHITESPACE',
+        'NAME',
+    ]
+
+
+def test_lexer_reuse_after_unterminated_block_comment():
+    lexer = AHKLexer()
+    assert [tok.type for tok in lexer.tokenize('/* x')][:2] == ['DIVIDE', 'TIMES']
+    assert [tok.type for tok in lexer.tokenize('/* x */')] == ['BLOCK_COMMENT']
+
+
+def test_main_rejects_unknown_constructs(capsys):
+    with pytest.raises(SystemExit):
+        stress.main(['no_such_construct'])
+    assert 'no_such_construct' in capsys.readouterr().err
@@ -0,0 +1,67 @@
+import os
+import random
+import sys
+
+import pytest
+import regex as re
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.errors import AHKTokenizeError
+from ahk_ast.tokenizer import _scan_block_comment
+from ahk_ast.tokenizer import _scan_quoted_string
+from ahk_ast.tokenizer import tokenize
+
+
+def _types_and_values(text):
+    return [(tok.type, tok.value) for tok in tokenize(text)]
+
+
+@pytest.mark.parametrize('quote, pattern', [('"', r'"(?:[^"`]|`.)*"'), ("'", r"'(?:[^'`]|`.)*'")])
+def test_scan_quoted_string_matches_regex(quote, pattern):
+    compiled = re.compile(pattern, re.MULTILINE)
+    rng = random.Random(1234)
+    alphabet = [quote, '`', '\n', 'a', ' ', '"', "'"]
+    for _ in range(5000):
+        text = quote + ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        m = compiled.match(text)
+        assert _scan_quoted_string(text, 0, quote) == (m.end() if m else -1), repr(text)
+
+
+def test_scan_block_comment_matches_regex():
+    compiled = re.compile(r'/\*((.|\n))*?\*/', re.MULTILINE)
+    rng = random.Random(1234)
+    for _ in range(5000):
+        text = '/*' + ''.join(rng.choice('*/\na') for _ in range(rng.randint(0, 12)))
+        m = compiled.match(text)
+        assert _scan_block_comment(text, 0) == (m.end() if m else -1), repr(text)
+
+
+def test_escaped_quotes():
+    assert _types_and_values('"a`"b" \'c`\'d\'') == [
+        ('DOUBLE_QUOTED_STRING', '"a`"b"'),
+        ('WHITESPACE', ' '),
+        ('SINGLE_QUOTED_STRING', "'c`'d'"),
+    ]
+
+
+def test_unterminated_string_is_illegal():
+    with pytest.raises(AHKTokenizeError, match=r'Illegal character \'"\' at index 5'):
+        list(tokenize('a := "abc`\n"'))
+
+
+def test_block_comment_lineno():
+    tokens = list(tokenize('/* a\nb\n*/\nx'))
+    assert [(tok.type, tok.lineno) for tok in tokens] == [
+        ('BLOCK_COMMENT', 1),
+        ('NEWLINE', 3),
+        ('NAME', 4),
+    ]
+
+
+def test_unterminated_block_comment():
+    assert _types_and_values('/* a') == [
+        ('DIVIDE', '/'),
+        ('TIMES', '*'),
+        ('WHITESPACE', ' '),
+        ('NAME', 'a'),
+    ]
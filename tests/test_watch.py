@@ -0,0 +1,103 @@
+import io
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../')))
+from ahk_ast.model import *
+from ahk_ast.watch import main
+from ahk_ast.watch import Watcher
+
+
+def _touch(path, text):
+    path.write_text(text)
+    # make sure the change is visible even on filesystems with coarse mtimes
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_poll_reparses_only_changed_files(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    a = tmp_path / 'a.ahk'
+    b = tmp_path / 'sub' / 'b.ahk'
+    a.write_text('a := 1\n')
+    b.write_text('MsgBox "hi"\n')
+    (tmp_path / 'notes.txt').write_text('not a script')
+
+    watcher = Watcher(str(tmp_path))
+    changed, removed = watcher.poll()
+    assert sorted(changed) == sorted([str(a), str(b)])
+    assert removed == []
+    assert watcher.files[str(a)].program == Program(Assignment(Identifier('a'), Integer(1)))
+    b_state = watcher.files[str(b)]
+
+    assert watcher.poll() == ([], [])
+
+    _touch(a, 'a := \n')
+    assert watcher.poll() == ([str(a)], [])
+    assert watcher.files[str(a)].error is not None
+    assert watcher.files[str(a)].program is None
+    assert watcher.files[str(b)] is b_state
+
+    b.unlink()
+    assert watcher.poll() == ([], [str(b)])
+    assert str(b) not in watcher.files
+
+
+def test_poll_skips_directories_that_disappear_or_cannot_be_read(tmp_path, monkeypatch):
+    (tmp_path / 'gone').mkdir()
+    (tmp_path / 'gone' / 'b.ahk').write_text('a := 1\n')
+    (tmp_path / 'locked').mkdir()
+    (tmp_path / 'locked' / 'c.ahk').write_text('a := 1\n')
+    a = tmp_path / 'a.ahk'
+    a.write_text('a := 1\n')
+    scandir = os.scandir
+
+    def racing_scandir(path):
+        if not isinstance(path, str):
+            # shutil.rmtree scans by file descriptor
+            return scandir(path)
+        if os.path.basename(path) == 'gone':
+            # removed between being listed and being opened
+            shutil.rmtree(path)
+        elif os.path.basename(path) == 'locked':
+            raise PermissionError(13, 'Permission denied', path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', racing_scandir)
+    watcher = Watcher(str(tmp_path))
+    assert watcher.poll() == ([str(a)], [])
+
+
+def test_report_prints_diagnostics(tmp_path):
+    good = tmp_path / 'good.ahk'
+    bad = tmp_path / 'bad.ahk'
+    good.write_text('a := 1\n')
+    bad.write_text('a := \n')
+    watcher = Watcher(str(tmp_path))
+    out = io.StringIO()
+    assert watcher.report(out) == 1
+    lines = out.getvalue().splitlines()
+    assert f'{good}: ok' in lines
+    assert any(line.startswith(f'{bad}:1:') for line in lines)
+
+    out = io.StringIO()
+    _touch(bad, 'a := 2\n')
+    assert watcher.report(out) == 0
+    assert out.getvalue() == f'{bad}: ok\n'
+
+
+def test_report_locates_tokenize_errors(tmp_path):
+    bad = tmp_path / 'bad.ahk'
+    bad.write_text('a := 1\nb := "oops\n')
+    out = io.StringIO()
+    assert Watcher(str(tmp_path)).report(out) == 1
+    assert out.getvalue().startswith(f'{bad}:2:6: Illegal character')
+
+
+def test_main_once(tmp_path, capsys):
+    (tmp_path / 'a.ahk').write_text('a := 1\n')
+    assert main(['--once', str(tmp_path)]) == 0
+    (tmp_path / 'b.ahk').write_text('a := \n')
+    assert main(['--once', str(tmp_path)]) == 1
+    assert 'b.ahk:1:' in capsys.readouterr().out